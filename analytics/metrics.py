@@ -0,0 +1,172 @@
+import numpy as np
+
+TIME_METRICS = ("waiting", "turnaround", "response")
+PERCENTILES = (50, 95, 99)
+
+
+def _columns(part, fields):
+    # Accept either columnar output (dict of arrays) or the row dicts.
+    if isinstance(part, dict):
+        return {f: np.asarray(part[f]) for f in fields if f in part}
+    return {f: np.fromiter((row[f] for row in part), dtype=np.float64, count=len(part))
+            for f in fields if part and f in part[0]}
+
+
+def _segments(gantt):
+    # Gantt columns with a pid index, where -1 marks switch overhead, and an
+    # "io" mask when the run had I/O waits.
+    seg = _columns(gantt, ("pid_idx", "start", "end", "core", "io"))
+    if not isinstance(gantt, dict):
+        if gantt and "core" in gantt[0]:
+            # I/O waits have no core.
+            seg["core"] = np.fromiter((-1 if s["core"] is None else s["core"] for s in gantt),
+                                      dtype=np.int64, count=len(gantt))
+        if "io" in seg:
+            seg["io"] = seg["io"].astype(bool)
+        pids = np.asarray([s["pid"] for s in gantt], dtype=object)
+        overhead = np.fromiter((p is None for p in pids), dtype=bool, count=len(pids))
+        pid_idx = np.full(len(pids), -1, dtype=np.int64)
+        if not overhead.all():
+            pid_idx[~overhead] = np.unique(pids[~overhead], return_inverse=True)[1]
+        seg["pid_idx"] = pid_idx
+    return seg
+
+
+def _overlap(*intervals):
+    # Total time during which every (start, end) set has an open interval.
+    points = np.concatenate([np.concatenate([s, e]) for s, e in intervals])
+    if not points.size:
+        return 0.0
+    order = np.argsort(points, kind="stable")
+    inside = np.ones(points.size - 1, dtype=bool)
+    offset = 0
+    for s, _ in intervals:
+        delta = np.zeros(points.size)
+        delta[offset:offset + len(s)] = 1
+        delta[offset + len(s):offset + 2 * len(s)] = -1
+        inside &= np.cumsum(delta[order])[:-1] > 0
+        offset += 2 * len(s)
+    return float(np.diff(points[order])[inside].sum())
+
+
+def jain_index(values):
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return None
+    denom = values.size * np.dot(values, values)
+    return float(values.sum() ** 2 / denom) if denom > 0 else None
+
+
+def _core_count(seg, cores):
+    if cores is not None:
+        return cores
+    core = seg.get("core")
+    return int(core.max()) + 1 if core is not None and core.size else 1
+
+
+def core_utilisation(gantt, cores=None):
+    """Busy fraction of each core over the run's makespan.
+
+    Switch overhead and I/O waits do not count as busy.  ``cores``
+    defaults to the highest core index in ``gantt`` plus one; single-core
+    Gantt charts count as core 0.
+    """
+    seg = _segments(gantt)
+    cores = _core_count(seg, cores)
+    end = seg.get("end", np.empty(0))
+    total_time = float(end.max()) if end.size else 0.0
+    useful = seg.get("pid_idx", np.empty(0)) >= 0
+    if "io" in seg:
+        useful &= ~seg["io"]
+    start = seg.get("start", np.empty(0))[useful]
+    end = end[useful]
+    core = seg.get("core", np.zeros(useful.size, dtype=np.int64)).astype(np.int64)[useful]
+    busy = np.bincount(core, weights=end - start, minlength=cores) if start.size else np.zeros(cores)
+    return busy / total_time if total_time > 0 else busy
+
+
+def summarize(gantt, results, cores=None):
+    """Aggregate statistics for one run.
+
+    ``gantt`` and ``results`` are what an engine returns, in either output
+    mode.  Fairness is Jain's index over each process' service rate
+    ((burst + io) / turnaround), so 1.0 means every process was slowed equally.
+    Multi-core runs report utilisation over all ``cores`` and count context
+    switches per core.  Switch overhead is reported as ``overhead_time`` and
+    is neither busy nor idle time.  ``io_time`` sums every process' I/O
+    waits, and ``io_overlap`` is the share of the time with some I/O in
+    flight during which a CPU was busy (None without I/O).
+    """
+    res = _columns(results, ("burst", "io") + TIME_METRICS)
+    seg = _segments(gantt)
+
+    n = len(res.get("waiting", ()))
+    summary = {"n_processes": n}
+    if n:
+        stacked = np.vstack([res[m].astype(np.float64) for m in TIME_METRICS])
+        means = stacked.mean(axis=1)
+        stds = stacked.std(axis=1)
+        maxes = stacked.max(axis=1)
+        pct = np.percentile(stacked, PERCENTILES, axis=1)
+        for k, m in enumerate(TIME_METRICS):
+            summary[f"avg_{m}"] = float(means[k])
+            for p, row in zip(PERCENTILES, pct):
+                summary[f"p{p}_{m}"] = float(row[k])
+            summary[f"max_{m}"] = float(maxes[k])
+            summary[f"std_{m}"] = float(stds[k])
+
+    start = seg.get("start", np.empty(0))
+    end = seg.get("end", np.empty(0))
+    total_time = float(end.max()) if end.size else 0.0
+    pid_idx = seg.get("pid_idx", np.empty(0, dtype=np.int64))
+    io = seg.get("io", np.zeros(pid_idx.size, dtype=bool))
+    io_start, io_end = start[io], end[io]
+    cpu = ~io
+    useful = (pid_idx >= 0) & cpu
+    overhead_time = float((end[cpu & ~useful] - start[cpu & ~useful]).sum())
+    start, end, pid_idx = start[useful], end[useful], pid_idx[useful]
+    busy_time = float((end - start).sum()) if end.size else 0.0
+    cores = _core_count(seg, cores)
+    core = seg.get("core")
+    core = core[useful] if core is not None else None
+    io_span = _overlap((io_start, io_end)) if io_start.size else 0.0
+    if core is not None and core.size:
+        by_core = np.lexsort((start, core))
+        pid_idx = pid_idx[by_core]
+        same_core = core[by_core][1:] == core[by_core][:-1]
+        switches = int(np.count_nonzero((pid_idx[1:] != pid_idx[:-1]) & same_core))
+    else:
+        switches = int(np.count_nonzero(pid_idx[1:] != pid_idx[:-1]))
+    summary.update({
+        "cores": cores,
+        "total_time": total_time,
+        "busy_time": busy_time,
+        "overhead_time": overhead_time,
+        "idle_time": total_time * cores - busy_time - overhead_time,
+        "cpu_utilisation": busy_time / (total_time * cores) if total_time > 0 else None,
+        "context_switches": switches,
+        "io_time": float((io_end - io_start).sum()),
+        "io_overlap": _overlap((io_start, io_end), (start, end)) / io_span if io_span > 0 else None,
+        "throughput": n / total_time if total_time > 0 else None,
+        "fairness": jain_index((res["burst"] + res.get("io", 0)) / res["turnaround"]) if n else None,
+    })
+    return summary
+
+
+def compare_summary(runs, cores=None):
+    """Summaries for several runs as one columnar table.
+
+    ``runs`` maps a label (e.g. algorithm name) to its ``(gantt, results)``,
+    all simulated on ``cores`` cores (see ``summarize``).  The result is a
+    dict of equal-length lists with a leading ``algorithm`` column, ready
+    for a single ``pd.DataFrame`` call.
+    """
+    table = {"algorithm": []}
+    for label, (gantt, results) in runs.items():
+        summary = summarize(gantt, results, cores)
+        if not summary["n_processes"]:
+            continue
+        table["algorithm"].append(label)
+        for key, value in summary.items():
+            table.setdefault(key, []).append(value)
+    return table
@@ -0,0 +1,166 @@
+import os
+from statistics import NormalDist
+
+import numpy as np
+
+from analytics.metrics import summarize
+from engine.algorithms import ALGORITHMS, run_algorithm
+from engine.multicore import MULTICORE_ALGORITHMS
+from engine.process_table import ProcessTable, as_process_table
+
+# Per-replica metrics aggregated across replicas.
+METRICS = ("avg_waiting", "avg_turnaround", "avg_response", "p95_waiting", "cpu_utilisation",
+           "context_switches", "throughput", "fairness")
+# Policies that rank processes by burst length, and so schedule by the
+# estimate when one is given.
+ESTIMATING = ("sjf_non_preemptive", "srtf")
+
+
+def perturb(table, seed, arrival_jitter=0, burst_noise=0, estimate_error=0):
+    """One replica of ``table``: ``(table, estimate)``.
+
+    Arrivals move by normal noise of standard deviation ``arrival_jitter``
+    time units (never before 0).  CPU bursts are scaled by a lognormal factor
+    of log-sd ``burst_noise`` (mean 1) and stay >= 1.  ``estimate`` holds
+    what the scheduler believes each burst to be: the actual burst times a
+    mean-1 lognormal error of log-sd ``estimate_error``, or None when that
+    is 0.  Integer tables stay integer, and the same ``seed`` gives the same
+    replica.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(table)
+    columns = (table.arrival, table.burst) + ((table.phases,) if table.phases is not None else ())
+    whole = all(column.typecode == "q" for column in columns)
+    arrival = np.frombuffer(table.arrival, dtype=table.arrival.typecode).astype(np.float64)
+    if arrival_jitter:
+        arrival = np.maximum(arrival + rng.normal(0.0, arrival_jitter, n), 0.0)
+    if table.phases is None:
+        cpu = np.frombuffer(table.burst, dtype=table.burst.typecode).astype(np.float64)
+    else:
+        phases = np.frombuffer(table.phases, dtype=table.phases.typecode).astype(np.float64)
+        bounds = np.frombuffer(table.phase_start, dtype=np.int64)
+        # Even offsets inside each process' run of phases are CPU bursts.
+        is_cpu = (np.arange(len(phases)) - np.repeat(bounds[:-1], np.diff(bounds))) % 2 == 0
+        cpu = phases[is_cpu]
+    if burst_noise:
+        cpu = np.maximum(cpu * rng.lognormal(-burst_noise ** 2 / 2, burst_noise, cpu.size), 1.0)
+    if whole:
+        arrival, cpu = np.rint(arrival).astype(np.int64), np.rint(cpu).astype(np.int64)
+    if table.phases is None:
+        burst, phases = cpu, None
+    else:
+        phases = phases.astype(cpu.dtype)
+        phases[is_cpu] = cpu
+        burst = np.add.reduceat(phases * is_cpu, bounds[:-1]) if n else cpu[:0]
+    estimate = None
+    if estimate_error:
+        estimate = (burst * rng.lognormal(-estimate_error ** 2 / 2, estimate_error, n)).tolist()
+    return ProcessTable(table.pids, arrival, burst, table.priority, phases,
+                        table.phase_start if phases is not None else None), estimate
+
+
+def _replicas(args):
+    # Worker: run every algorithm on each replica; one row of METRICS per run.
+    table, algorithms, replicas, seed, noise, run = args
+    quantum, cores, policy, options, switch_cost, migration_cost = run
+    rows = []
+    for k in replicas:
+        replica, estimate = perturb(table, (seed, k), *noise)
+        for name in algorithms:
+            extra = dict(options.get(name) or {})
+            if estimate is not None and name in ESTIMATING:
+                extra["estimate"] = estimate
+            gantt, results = run_algorithm(name, replica, quantum, "columns", cores, policy, extra,
+                                           switch_cost, migration_cost)
+            summary = summarize(gantt, results, cores)
+            rows.append((name, [summary[m] for m in METRICS]))
+    return rows
+
+
+def _accumulate(stats, rows):
+    # Welford's running mean and sum of squared deviations per algorithm and
+    # metric, so memory stays constant however many replicas run.
+    for name, values in rows:
+        per_metric = stats.setdefault(name, {m: [0, 0.0, 0.0] for m in METRICS})
+        for metric, value in zip(METRICS, values):
+            if value is None:
+                continue
+            acc = per_metric[metric]
+            acc[0] += 1
+            delta = value - acc[1]
+            acc[1] += delta / acc[0]
+            acc[2] += delta * (value - acc[1])
+
+
+def confidence_intervals(stats, confidence=0.95):
+    """``{algorithm: {metric: {"n", "mean", "std", "low", "high"}}}`` from the
+    running statistics, using the normal approximation for the mean."""
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    out = {}
+    for name, per_metric in stats.items():
+        out[name] = {}
+        for metric, (n, mean, m2) in per_metric.items():
+            std = (m2 / (n - 1)) ** 0.5 if n > 1 else 0.0
+            half = z * std / n ** 0.5 if n else 0.0
+            out[name][metric] = {"n": n, "mean": mean, "std": std, "low": mean - half, "high": mean + half}
+    return out
+
+
+def monte_carlo(process_list, algorithms, replicas=100, seed=0, arrival_jitter=0, burst_noise=0,
+                estimate_error=0, quantum=None, cores=1, policy="global", options=None, switch_cost=0,
+                migration_cost=0, confidence=0.95, max_workers=None, executor=None, chunk_size=None):
+    """Run ``algorithms`` on ``replicas`` perturbed copies of a workload.
+
+    Each replica is ``perturb(table, (seed, k), ...)``, so results do not
+    depend on how replicas are spread over workers.  Replicas go to a process
+    pool in chunks (one pickled table per chunk); this is a generator that
+    yields ``(replicas_done, confidence_intervals(...))`` each time a chunk
+    finishes, in completion order, so callers can show intervals narrowing.
+    """
+    table = as_process_table(process_list)
+    algorithms = list(dict.fromkeys(algorithms))
+    unknown = [name for name in algorithms if name not in ALGORITHMS]
+    if unknown:
+        raise ValueError(f"unknown algorithm(s) {unknown}; expected some of {sorted(ALGORITHMS)}")
+    if cores != 1 and any(name not in MULTICORE_ALGORITHMS for name in algorithms):
+        raise ValueError(f"multi-core runs support {MULTICORE_ALGORITHMS}")
+    if replicas < 1 or arrival_jitter < 0 or burst_noise < 0 or estimate_error < 0:
+        raise ValueError("replicas must be >= 1 and the noise levels >= 0")
+    if estimate_error and any(name in ESTIMATING for name in algorithms) and (cores != 1 or table.phases is not None):
+        raise ValueError("burst estimates need a single-core run of processes without I/O phases")
+    table.order  # sorted once, before the table is pickled
+    noise = (arrival_jitter, burst_noise, estimate_error)
+    run = (quantum, cores, policy, options or {}, switch_cost, migration_cost)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if chunk_size is None:
+        # A few chunks per worker keeps the pool busy and the updates coming.
+        chunk_size = max(1, min(64, replicas // (4 * max(max_workers, 1))))
+    chunks = [(table, algorithms, range(k, min(k + chunk_size, replicas)), seed, noise, run)
+              for k in range(0, replicas, chunk_size)]
+
+    stats = {}
+    done = 0
+    if executor is None and (max_workers < 2 or len(chunks) < 2):
+        for chunk in chunks:
+            _accumulate(stats, _replicas(chunk))
+            done += len(chunk[2])
+            yield done, confidence_intervals(stats, confidence)
+        return
+
+    from concurrent.futures import as_completed
+    pool = executor
+    if pool is None:
+        # Deferred: the process pool pulls in multiprocessing.
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {pool.submit(_replicas, chunk): len(chunk[2]) for chunk in chunks}
+        for future in as_completed(futures):
+            _accumulate(stats, future.result())
+            done += futures[future]
+            yield done, confidence_intervals(stats, confidence)
+    finally:
+        if executor is None:
+            pool.shutdown(cancel_futures=True)
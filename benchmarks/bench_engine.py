@@ -0,0 +1,220 @@
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+from engine import differential
+from engine.algorithms import ALGORITHMS, run_algorithm
+from engine.multicore import MULTICORE_ALGORITHMS, POLICIES
+from engine.online import ONLINE_ALGORITHMS, OnlineScheduler
+from engine.workloads import ARRIVALS, generate_workload
+
+PROFILES = {
+    "smoke": [10, 1000],
+    "quick": [10, 1000, 10000],
+    "full": [10, 1000, 10000, 100000, 1000000],
+}
+BURSTS = ("uniform", "exponential", "pareto")
+# Offered load: total burst divided by the arrival window.
+SPARSITY = {"dense": 2.0, "balanced": 0.9, "sparse": 0.1}
+
+
+def make_table(n, dist, sparsity, seed=0, arrival="poisson", cores=1):
+    return generate_workload(n, arrival=arrival, burst=dist, seed=seed, load=SPARSITY[sparsity] * cores)
+
+
+def _cases(algorithms, quanta):
+    for name in algorithms:
+        if name == "round_robin":
+            for q in quanta:
+                yield name, q
+        else:
+            yield name, None
+
+
+def measure(name, table, quantum, repeat, memory, cores=1, policy="global"):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        gantt, _ = run_algorithm(name, table, quantum, output="rows", cores=cores, policy=policy)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+        segments = len(gantt)
+        del gantt
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        run_algorithm(name, table, quantum, output="rows", cores=cores, policy=policy)
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return {"wall_s": best, "peak_mib": peak, "segments": segments}
+
+
+def run_suite(sizes, algorithms, quanta, bursts=BURSTS, sparsity=tuple(SPARSITY), repeat=3,
+              memory=True, seed=0, log=None, arrival="poisson", cores=1, policy="global"):
+    results = {}
+    for n, dist, sp in itertools.product(sizes, bursts, sparsity):
+        # Offered load is per core, so multi-core runs stay in the same regime.
+        table = make_table(n, dist, sp, seed, arrival, cores)
+        table.order
+        for name, q in _cases(algorithms, quanta):
+            key = f"{name}{'' if q is None else f'[q={q}]'}/{dist}/{sp}/n={n}"
+            if cores > 1:
+                key += f"/cores={cores}/{policy}"
+            results[key] = measure(name, table, q, repeat if n < 100000 else 1, memory, cores, policy)
+            if log:
+                r = results[key]
+                mem = "" if r["peak_mib"] is None else f"{r['peak_mib']:>9.1f} MiB"
+                log(f"{key:<52}{r['wall_s']:>10.4f} s{r['segments']:>10} seg{mem}")
+    return results
+
+
+def fractional_workload(seed, n=200):
+    rng = random.Random(seed)
+    return [{"pid": f"P{i}", "arrival": round(rng.uniform(0, n / 4), 1), "burst": round(rng.uniform(0.1, 3), 1),
+             "priority": rng.randint(1, 3)} for i in range(n)]
+
+
+def _short_served(gantt, results, n):
+    if len(results) != n:
+        return f"{len(results)} of {n} processes completed"
+    served = {}
+    for seg in gantt:
+        served[seg["pid"]] = served.get(seg["pid"], 0) + seg["end"] - seg["start"]
+    for row in results:
+        if abs(served.get(row["pid"], 0) - row["burst"]) > 1e-6:
+            return f"{row['pid']} served {served.get(row['pid'], 0)} of a {row['burst']} burst"
+    return None
+
+
+def check_engines(timeout=30, trials=200):
+    """Correctness pass run before timing.  The single-core engines must
+    match engine.reference on ``trials`` fixed-seed random workloads each
+    (see engine.differential).  Every multi-core engine gets fractional
+    arrivals and bursts on several cores, and the online scheduler the same
+    feeds; a slice ending on a rounding error once left a sliver of work and
+    the run never finished.  Each process must complete with exactly its
+    burst served.  Returns a list of problems, empty when all is well."""
+    problems = []
+
+    def run():
+        for failure in differential.check(trials=trials, seed=0):
+            q = "" if failure["quantum"] is None else f" quantum={failure['quantum']}"
+            problems.append(f"{failure['algorithm']}{q} differs from engine.reference: {failure['difference']} "
+                            f"on {json.dumps(failure['workload'])}")
+        for seed, name in itertools.product(range(3), ONLINE_ALGORITHMS):
+            case = f"online/{name}/seed={seed}"
+            scheduler = OnlineScheduler(name, 0.3 if name == "round_robin" else None)
+            for process in fractional_workload(seed):
+                scheduler.submit(process)
+            gantt, results = [], []
+            for kind, item in scheduler.drain():
+                (gantt if kind == "segment" else results).append(item)
+            short = _short_served(gantt, results, 200)
+            if short:
+                problems.append(f"{case}: {short}")
+        for seed, name, cores, policy in itertools.product(range(3), MULTICORE_ALGORITHMS, (2, 3), POLICIES):
+            case = f"{name}/cores={cores}/{policy}/seed={seed}"
+            try:
+                gantt, results = run_algorithm(name, fractional_workload(seed), 0.3 if name == "round_robin" else None,
+                                               cores=cores, policy=policy)
+            except Exception as exc:
+                problems.append(f"{case}: raised {type(exc).__name__}: {exc}")
+                continue
+            short = _short_served(gantt, results, 200)
+            if short:
+                problems.append(f"{case}: {short}")
+
+    # A hang cannot be interrupted, so the check runs on a daemon thread.
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        problems.append(f"the engines did not finish fractional workloads within {timeout}s")
+    return problems
+
+
+def find_regressions(current, baseline, threshold, min_time=0.005):
+    regressions = []
+    for key, now in current.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if before["wall_s"] >= min_time and now["wall_s"] > before["wall_s"] * (1 + threshold):
+            regressions.append(f"{key}: wall {before['wall_s']:.4f}s -> {now['wall_s']:.4f}s")
+        if before.get("peak_mib") and now.get("peak_mib") and now["peak_mib"] > before["peak_mib"] * (1 + threshold):
+            regressions.append(f"{key}: peak {before['peak_mib']:.1f} MiB -> {now['peak_mib']:.1f} MiB")
+        if now["segments"] != before["segments"]:
+            regressions.append(f"{key}: segments {before['segments']} -> {now['segments']}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every scheduling algorithm on synthetic workloads")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--sizes", type=int, nargs="+", help="override the profile's process counts")
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(ALGORITHMS),
+                        help="default: every algorithm that supports --cores")
+    parser.add_argument("--bursts", nargs="+", choices=BURSTS, default=list(BURSTS))
+    parser.add_argument("--sparsity", nargs="+", choices=list(SPARSITY), default=list(SPARSITY))
+    parser.add_argument("--arrival", choices=ARRIVALS, default="poisson")
+    parser.add_argument("--quanta", type=int, nargs="+", default=[2, 8])
+    parser.add_argument("--repeat", type=int, default=3, help="best-of-N timing for n < 100000")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--cores", type=int, default=1, help="simulate this many cores")
+    parser.add_argument("--policy", choices=POLICIES, default="global")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown / memory growth before failing (0.25 = 25%%)")
+    parser.add_argument("--min-time", type=float, default=0.005,
+                        help="ignore timing changes on cases faster than this in the baseline")
+    parser.add_argument("--skip-checks", action="store_true", help="skip the correctness pass before timing")
+    args = parser.parse_args(argv)
+    single_core = [name for name in args.algorithms or () if name not in MULTICORE_ALGORITHMS]
+    if args.cores > 1 and single_core:
+        parser.error(f"{', '.join(single_core)} cannot run on more than one core")
+    algorithms = args.algorithms or list(ALGORITHMS if args.cores == 1 else MULTICORE_ALGORITHMS)
+
+    if not args.skip_checks:
+        problems = check_engines()
+        if problems:
+            print(f"{len(problems)} engine check(s) failed:")
+            for line in problems:
+                print(f"  {line}")
+            return 1
+
+    results = run_suite(args.sizes or PROFILES[args.profile], algorithms, args.quanta,
+                        args.bursts, args.sparsity, args.repeat, not args.no_memory, args.seed, log=print,
+                        arrival=args.arrival, cores=args.cores, policy=args.policy)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump({"python": sys.version.split()[0], "machine": platform.machine(),
+                       "seed": args.seed, "results": results}, fh, indent=2, sort_keys=True)
+        print(f"saved {len(results)} results to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)["results"]
+        regressions = find_regressions(results, baseline, args.threshold, args.min_time)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"no regressions against {args.baseline} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import argparse
+import random
+import time
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from engine.algorithms import srtf
+from ui.charts import build_gantt_figure, compact_color_map
+
+
+def legacy_build_gantt_figure(gantt_df, sim_time, view_mode="Single-line"):
+    # The one-trace-per-segment renderer that ui.charts replaced.
+    cmap = compact_color_map(gantt_df["pid"].unique().tolist())
+    if view_mode == "Single-line":
+        df = gantt_df.copy().sort_values(by=["start"]).reset_index(drop=True)
+        df["label"] = df.apply(lambda r: f"{r['pid']} ({int(r['start'])}→{int(r['end'])})", axis=1)
+        fig = go.Figure()
+        for idx, row in df.iterrows():
+            is_running = (sim_time is not None and row["start"] <= sim_time < row["end"])
+            fig.add_trace(go.Bar(
+                x=[row["duration"]], y=["CPU"], base=[row["start"]], orientation="h",
+                marker=dict(color=cmap[row["pid"]], line=dict(color="white" if is_running else "rgba(0,0,0,0)", width=3 if is_running else 0)),
+                hovertemplate=f"<b>{row['pid']}</b><br>Start: {row['start']}<br>End: {row['end']}<extra></extra>",
+                text=[row["label"]], textposition="inside", insidetextanchor="middle", cliponaxis=False, showlegend=False
+            ))
+        fig.update_xaxes(title_text="Time", tick0=0, dtick=1, zeroline=True)
+        fig.update_layout(barmode="stack", height=240)
+        return fig
+    fig = go.Figure()
+    for _, row in gantt_df.iterrows():
+        is_running = (sim_time is not None and row["start"] <= sim_time < row["end"])
+        fig.add_trace(go.Bar(
+            x=[row["duration"]], y=[row["pid"]], base=[row["start"]], orientation="h",
+            marker=dict(color=cmap[row["pid"]], line=dict(color="white" if is_running else "rgba(0,0,0,0)", width=3 if is_running else 0)),
+            hovertemplate=f"<b>{row['pid']}</b><br>Start: {row['start']}<br>End: {row['end']}<extra></extra>",
+            text=[row["pid"]], textposition="inside", insidetextanchor="middle", cliponaxis=False, showlegend=False
+        ))
+    fig.update_layout(barmode="stack", height=420, yaxis=dict(autorange="reversed"))
+    return fig
+
+
+def make_gantt_df(n, seed=0):
+    rng = random.Random(seed)
+    plist = [{"pid": f"P{i + 1}", "arrival": rng.randint(0, n * 4), "burst": rng.randint(1, 20)}
+             for i in range(n)]
+    gantt, _ = srtf(plist)
+    df = pd.DataFrame(gantt)
+    df["start"] = df["start"].astype(float)
+    df["end"] = df["end"].astype(float)
+    df["duration"] = df["end"] - df["start"]
+    return df
+
+
+def measure(builder, df, view_mode):
+    t0 = time.perf_counter()
+    fig = builder(df, float(df["end"].max()) / 2, view_mode)
+    build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    payload = len(fig.to_json())
+    return build, time.perf_counter() - t0, payload, len(fig.data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gantt figure build time and JSON payload size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--legacy-limit", type=int, default=5000,
+                        help="skip the per-segment renderer above this many processes")
+    args = parser.parse_args(argv)
+
+    print(f"{'renderer':<10}{'view':<17}{'segments':>9}{'traces':>8}{'build (s)':>11}{'json (s)':>10}{'payload':>12}")
+    for n in args.sizes:
+        df = make_gantt_df(n)
+        for view_mode in ("Single-line", "Stacked per PID"):
+            builders = [("current", build_gantt_figure)]
+            if n <= args.legacy_limit:
+                builders.insert(0, ("legacy", legacy_build_gantt_figure))
+            for name, builder in builders:
+                build, dump, payload, traces = measure(builder, df, view_mode)
+                print(f"{name:<10}{view_mode:<17}{len(df):>9}{traces:>8}{build:>11.3f}{dump:>10.3f}{payload:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import random
+import time
+
+from engine import algorithms, reference
+
+
+def make_workload(n, burst_max, seed=0):
+    rng = random.Random(seed)
+    span = max(1, n * (burst_max + 1) // 2)
+    return [
+        {"pid": f"P{i + 1}", "arrival": rng.randint(0, span),
+         "burst": rng.randint(1, burst_max), "priority": rng.randint(1, 10)}
+        for i in range(n)
+    ]
+
+
+def timed(fn, plist):
+    t0 = time.perf_counter()
+    out = fn(plist)
+    return time.perf_counter() - t0, out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Event-driven vs tick-by-tick preemptive engines")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--burst-max", type=int, default=20)
+    parser.add_argument("--legacy-limit", type=int, default=1000,
+                        help="skip the tick-by-tick engine above this many processes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'algorithm':<22}{'n':>8}{'event (s)':>12}{'tick (s)':>12}{'speedup':>10}")
+    for n in args.sizes:
+        plist = make_workload(n, args.burst_max, args.seed)
+        for name in ("srtf", "priority_preemptive"):
+            fast, fast_out = timed(getattr(algorithms, name), plist)
+            if n <= args.legacy_limit:
+                slow, slow_out = timed(getattr(reference, name), plist)
+                if slow_out != fast_out:
+                    raise SystemExit(f"{name}: schedules differ at n={n}")
+                slow_txt = f"{slow:>12.3f}"
+                speedup = f"{slow / fast:>9.1f}x"
+            else:
+                slow_txt = f"{'-':>12}"
+                speedup = f"{'-':>10}"
+            print(f"{name:<22}{n:>8}{fast:>12.3f}{slow_txt}{speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import ast
+import json
+import os
+import platform
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MARKER = "--bench-startup--"
+# Modules each entry point must not load at import time.
+FORBIDDEN = {
+    "engine": ("numpy", "pandas", "plotly", "streamlit", "multiprocessing"),
+    "cli": ("numpy", "pandas", "plotly", "streamlit"),
+    "ui": ("pandas", "plotly.express", "numpy"),
+}
+
+
+def _module_imports(path):
+    # The imports a script runs before its first line of real work: module
+    # level only, so imports deferred into functions and branches are skipped.
+    with open(path, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), path)
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def entry_points():
+    return {
+        "engine": ["import engine.algorithms", "import engine.multicore", "import engine.compare",
+                   "import engine.cache", "import engine.loaders", "import engine.workloads"],
+        "cli": ["import main"],
+        "ui": _module_imports(os.path.join(ROOT, "ui", "app.py")),
+    }
+
+
+def parse_importtime(stderr):
+    """Modules imported after the marker, as (name, depth, cumulative_us) in
+    the order ``-X importtime`` reports them (children before parents)."""
+    lines = stderr.splitlines()
+    lines = lines[lines.index(MARKER) + 1:] if MARKER in lines else lines
+    entries = []
+    for line in lines:
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # the column header
+        entries.append((name.strip(), (len(name) - len(name.lstrip()) - 1) // 2, int(cumulative)))
+    return entries
+
+
+def by_package(entries):
+    # Inclusive import time per top-level package, counted where the package
+    # is first entered from outside itself, so nested packages show up too.
+    totals, ancestors = {}, []
+    for name, depth, cumulative in reversed(entries):
+        del ancestors[depth:]
+        package = name.split(".")[0]
+        if package not in ancestors:
+            totals[package] = totals.get(package, 0) + cumulative
+        ancestors.append(package)
+    return totals
+
+
+def measure(statements, repeat):
+    # Best of `repeat` fresh interpreters; bytecode caches are warm after the
+    # first run, so this tracks import work rather than disk speed.
+    code = "import sys; sys.stderr.write(%r + '\\n'); sys.stderr.flush()\n" % MARKER + "\n".join(statements)
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                              capture_output=True, text=True)
+        if proc.returncode:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        entries = parse_importtime(proc.stderr)
+        total = sum(cumulative for _, depth, cumulative in entries if depth == 0) / 1000
+        if best is None or total < best["import_ms"]:
+            best = {"import_ms": total, "entries": entries}
+    return best
+
+
+def run_suite(names, repeat=5, top=5, log=None):
+    results = {}
+    points = entry_points()
+    for name in names:
+        run = measure(points[name], repeat)
+        loaded = [m for m, _, _ in run["entries"]]
+        banned = {m for m in loaded if any(m == f or m.startswith(f + ".") for f in FORBIDDEN[name])}
+        heaviest = sorted(by_package(run["entries"]).items(), key=lambda kv: -kv[1])[:top]
+        results[name] = {"import_ms": run["import_ms"], "modules": len(loaded), "forbidden": sorted(banned)}
+        if log:
+            log(f"{name:<8}{run['import_ms']:>9.1f} ms{len(loaded):>6} modules   "
+                + ", ".join(f"{m} {us / 1000:.1f}" for m, us in heaviest))
+    return results
+
+
+def find_regressions(current, baseline, threshold, min_time=5.0):
+    regressions = []
+    for key, now in current.items():
+        if now["forbidden"]:
+            regressions.append(f"{key}: imports {', '.join(now['forbidden'])}")
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if before["import_ms"] >= min_time and now["import_ms"] > before["import_ms"] * (1 + threshold):
+            regressions.append(f"{key}: import {before['import_ms']:.1f} ms -> {now['import_ms']:.1f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import time of the engine, CLI and UI entry points")
+    parser.add_argument("--entry", nargs="+", choices=sorted(FORBIDDEN), default=list(FORBIDDEN))
+    parser.add_argument("--repeat", type=int, default=5, help="best-of-N fresh interpreters")
+    parser.add_argument("--top", type=int, default=5, help="list this many of the slowest packages")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--min-time", type=float, default=5.0,
+                        help="ignore timing changes on entry points faster than this many ms in the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.entry, args.repeat, args.top, log=print)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump({"python": sys.version.split()[0], "machine": platform.machine(),
+                       "results": results}, fh, indent=2, sort_keys=True)
+        print(f"saved {len(results)} results to {args.save}")
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)["results"]
+    regressions = find_regressions(results, baseline, args.threshold, args.min_time)
+    if regressions:
+        print(f"{len(regressions)} regression(s):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    if args.baseline:
+        print(f"no regressions against {args.baseline} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,308 +1,676 @@
-def fcfs(process_list):
-    processes = sorted(process_list, key=lambda x: x['arrival'])
-    current_time = 0
-    gantt_chart = []
-    results = []
+import heapq
+from collections import deque
 
-    for p in processes:
-        start_time = max(current_time, p['arrival'])
-        end_time = start_time + p['burst']
-
-        gantt_chart.append({
-            "pid": p["pid"],
-            "start": start_time,
-            "end": end_time
-        })
-
-        completion_time = end_time
-        turnaround_time = completion_time - p['arrival']
-        waiting_time = turnaround_time - p['burst']
-        response_time = start_time - p['arrival']
-
-        results.append({
-            "pid": p["pid"],
-            "arrival": p["arrival"],
-            "burst": p["burst"],
-            "start": start_time,
-            "completion": completion_time,
-            "turnaround": turnaround_time,
-            "waiting": waiting_time,
-            "response": response_time
-        })
+from engine.columns import OUTPUT_MODES, OVERHEAD, build_columns
+from engine.process_table import as_process_table
+from engine.segments import SegmentStore, time_typecode
+
+# Output mode that returns the raw schedule instead of building an output;
+# engine.instrument uses it to time the output step on its own.
+_SCHEDULE = "schedule"
+
+
+def _heap_ops(stats):
+    # heappush / heappop for an engine loop.  With a stats dict they also
+    # count into its "heap_pushes" and "heap_pops"; without one they are the
+    # plain heapq functions, so ordinary runs pay nothing.
+    if stats is None:
+        return heapq.heappush, heapq.heappop
+
+    def heappush(heap, item):
+        stats["heap_pushes"] += 1
+        heapq.heappush(heap, item)
+
+    def heappop(heap):
+        stats["heap_pops"] += 1
+        return heapq.heappop(heap)
+
+    return heappush, heappop
+
+
+def _output(table, segments, rows, completion, started, output, extra=None, io=None):
+    # segments: SegmentStore of the CPU time, where pid index OVERHEAD marks
+    # context-switch time; rows: process indices in result order; started:
+    # the time each process' response is measured to.  io: SegmentStore of
+    # the I/O waits, for tables with phases.
+    if output == _SCHEDULE:
+        return table, segments, rows, completion, started, extra, io
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"output must be one of {OUTPUT_MODES}, got {output!r}")
+    if output == "columns":
+        return build_columns(table, segments, rows, completion, started, extra, io)
+
+    pids, arrival, burst, priority = table.pids, table.arrival, table.burst, table.priority
+    labels = list(pids) + [None]  # OVERHEAD (-1) segments get pid None
+    columns = segments.pid_idx, segments.start, segments.end
+    if segments.core is not None:
+        gantt_chart = [{"pid": labels[j], "core": c, "start": s, "end": e} for j, s, e, c in zip(*columns, segments.core)]
+    else:
+        gantt_chart = [{"pid": labels[j], "start": s, "end": e} for j, s, e in zip(*columns)]
+    io_total = None
+    if table.phases is not None:
+        for seg in gantt_chart:
+            seg["io"] = False
+        blank = {"core": None} if segments.core is not None else {}
+        if io is not None:
+            gantt_chart.extend({"pid": pids[j], **blank, "start": s, "end": e, "io": True}
+                               for j, s, e in zip(io.pid_idx, io.start, io.end))
+        io_total = table.io_totals()
 
-        current_time = end_time
+    results = []
+    for j in rows:
+        row = {"pid": pids[j], "arrival": arrival[j], "burst": burst[j]}
+        if io_total is not None:
+            row["io"] = io_total[j]
+        if extra == "priority":
+            row["priority"] = priority[j]
+        elif extra == "start":
+            row["start"] = started[j]
+        row["completion"] = completion[j]
+        row["turnaround"] = completion[j] - arrival[j]
+        row["waiting"] = row["turnaround"] - burst[j] - (io_total[j] if io_total is not None else 0)
+        row["response"] = started[j] - arrival[j]
+        results.append(row)
 
     return gantt_chart, results
 
 
+def _switch(segments, time, cost):
+    # Charge one context switch starting at `time`; returns when it ends.
+    segments[0].append(OVERHEAD)
+    segments[1].append(time)
+    segments[2].append(time + cost)
+    return time + cost
 
 
+def _run_blocking(name, table, output, switch_cost, quantum=None, stats=None):
+    # Tables with I/O phases go through the event-driven engine on one core,
+    # which tracks blocked processes and their wakeups.
+    from engine.multicore import run_multicore
 
-def sjf_non_preemptive(process_list):
-    processes = sorted(process_list, key=lambda x: x['arrival'])
-    time = 0
-    completed = []
-    gantt_chart = []
+    table, segments, rows, completion, started, extra, io = run_multicore(
+        name, table, 1, quantum, output=_SCHEDULE, switch_cost=switch_cost, stats=stats)
+    segments.core = None  # single core: no core column
+    return _output(table, segments, rows, completion, started, output, extra, io)
 
-    while len(completed) < len(processes):
-        available = [p for p in processes if p['arrival'] <= time and p not in completed]
-        if not available:
-            time += 1
-            continue
 
-        current = min(available, key=lambda x: x['burst'])
-        start_time = time
-        end_time = time + current['burst']
+def fcfs(process_list, output="rows", switch_cost=0, stats=None):
+    table = as_process_table(process_list)
+    if table.phases is not None:
+        return _run_blocking("fcfs", table, output, switch_cost, stats=stats)
+    arrival, burst = table.arrival, table.burst
+    n = len(table)
+    current_time = 0
+    segments = SegmentStore(time_typecode(table, switch_cost))
+    seg_idx, seg_start, seg_end = segments.pid_idx, segments.start, segments.end
+    started = [None] * n
+    completion = [None] * n
+
+    for i in table.order:
+        start_time = max(current_time, arrival[i])
+        if switch_cost:
+            start_time = _switch((seg_idx, seg_start, seg_end), start_time, switch_cost)
+        end_time = start_time + burst[i]
+
+        seg_idx.append(i)
+        seg_start.append(start_time)
+        seg_end.append(end_time)
+        started[i] = start_time
+        completion[i] = end_time
 
-        gantt_chart.append({
-            "pid": current['pid'],
-            "start": start_time,
-            "end": end_time
-        })
+        current_time = end_time
 
-        current['completion'] = end_time
-        current['turnaround'] = end_time - current['arrival']
-        current['waiting'] = current['turnaround'] - current['burst']
-        current['response'] = start_time - current['arrival']
+    return _output(table, segments, table.order, completion, started, output, extra="start")
 
-        completed.append(current)
-        time = end_time
 
-    results = []
-    for p in completed:
-        results.append({
-            "pid": p["pid"],
-            "arrival": p["arrival"],
-            "burst": p["burst"],
-            "completion": p["completion"],
-            "turnaround": p["turnaround"],
-            "waiting": p["waiting"],
-            "response": p["response"],
-        })
 
-    return gantt_chart, results
- 
 
 
-def srtf(process_list):
-    processes = [
-        {"pid": p["pid"], "arrival": p["arrival"], "burst": p["burst"], "remaining": p["burst"]}
-        for p in process_list
-    ]
+def _run_non_preemptive(table, keys, switch_cost=0, stats=None):
+    heappush, heappop = _heap_ops(stats)
+    arrival, burst, order = table.arrival, table.burst, table.order
+    n = len(table)
+    ready = []
+    rows = []
+    segments = SegmentStore(time_typecode(table, switch_cost))
+    seg_idx, seg_start, seg_end = segments.pid_idx, segments.start, segments.end
+    time = 0
+    i = 0
+
+    while len(rows) < n:
+        while i < n and arrival[order[i]] <= time:
+            heappush(ready, (keys[order[i]], i))
+            i += 1
 
+        if not ready:
+            time = max(time, arrival[order[i]])
+            continue
+
+        _, k = heappop(ready)
+        j = order[k]
+        if switch_cost:
+            time = _switch((seg_idx, seg_start, seg_end), time, switch_cost)
+        rows.append(j)
+        seg_idx.append(j)
+        seg_start.append(time)
+        time += burst[j]
+        seg_end.append(time)
+
+    completion = [None] * n
+    started = [None] * n
+    for j, s, e in zip(seg_idx, seg_start, seg_end):
+        if j != OVERHEAD:
+            started[j] = s
+            completion[j] = e
+
+    return segments, rows, completion, started
+
+
+def _check_estimate(table, estimate):
+    if table.phases is not None:
+        raise ValueError("burst estimates are only supported for processes without I/O phases")
+    if len(estimate) != len(table):
+        raise ValueError("estimate needs one value per process")
+
+
+def sjf_non_preemptive(process_list, output="rows", switch_cost=0, estimate=None, stats=None):
+    # estimate: the burst lengths the scheduler believes, one per process;
+    # processes still run for their real bursts.
+    table = as_process_table(process_list)
+    if estimate is not None:
+        _check_estimate(table, estimate)
+    if table.phases is not None:
+        return _run_blocking("sjf_non_preemptive", table, output, switch_cost, stats=stats)
+    segments, rows, completion, started = _run_non_preemptive(table, estimate if estimate is not None else table.burst,
+                                                              switch_cost, stats)
+    return _output(table, segments, rows, completion, started, output)
+
+
+
+def _run_preemptive(table, keys=None, switch_cost=0, estimate=None, stats=None):
+    # keys=None orders the ready heap by remaining time (SRTF); otherwise by
+    # the given static key, e.g. priority.  With an estimate, SRTF ranks by
+    # estimated remaining time (estimate - time served, at least 0) instead.
+    # A switch is atomic: arrivals during it are considered once it ends,
+    # which may switch again.
+    heappush, heappop = _heap_ops(stats)
+    pids, arrival, order = table.pids, table.arrival, table.order
+    n = len(table)
+    remaining = list(table.burst)
+    # remaining + bias is the estimated remaining time.
+    bias = None if estimate is None else [e - b for e, b in zip(estimate, table.burst)]
+    first_start = [None] * n
+    last_start = [None] * n
+    completion = [None] * n
+    ready = []
+    segments = SegmentStore(time_typecode(table, switch_cost))
+    seg_idx, seg_start, seg_end = segments.pid_idx, segments.start, segments.end
     time = 0
     completed = 0
-    n = len(processes)
-    gantt_chart = []
     last_pid = None
+    loaded = None
+    i = 0
 
     while completed < n:
-        available = [p for p in processes if p["arrival"] <= time and p["remaining"] > 0]
+        while i < n and arrival[order[i]] <= time:
+            j = order[i]
+            key = remaining[j] if keys is None else keys[j]
+            heappush(ready, (key if bias is None else max(key + bias[j], 0), j))
+            i += 1
 
-        if not available:
-            time += 1
+        if not ready:
+            time = max(time, arrival[order[i]])
             continue
 
-        current = min(available, key=lambda x: x["remaining"])
-
-        if current["pid"] != last_pid:
-            gantt_chart.append({"pid": current["pid"], "start": time})
-            last_pid = current["pid"]
-
-        current["remaining"] -= 1
-        time += 1
-        gantt_chart[-1]["end"] = time
+        entry = heappop(ready)
+        j = entry[1]
+        if switch_cost and j != loaded:
+            time = _switch((seg_idx, seg_start, seg_end), time, switch_cost)
+            loaded = j
+            last_pid = None
+            heappush(ready, entry)
+            continue
 
-        if current["remaining"] == 0:
-            current["completion"] = time
-            current["turnaround"] = current["completion"] - current["arrival"]
-            current["waiting"] = current["turnaround"] - current["burst"]
-            current["response"] = gantt_chart[-1]["start"] - current["arrival"]
+        if pids[j] != last_pid:
+            seg_idx.append(j)
+            seg_start.append(time)
+            seg_end.append(time)
+            last_pid = pids[j]
+
+        if first_start[j] is None:
+            first_start[j] = time
+
+        finish = time + remaining[j]
+        if i < n and arrival[order[i]] < finish:
+            next_arrival = arrival[order[i]]
+            remaining[j] -= next_arrival - time
+            time = next_arrival
+            key = remaining[j] if keys is None else keys[j]
+            heappush(ready, (key if bias is None else max(key + bias[j], 0), j))
+        else:
+            remaining[j] = 0
+            time = finish
+            completion[j] = time
+            last_start[j] = seg_start[-1]
             completed += 1
 
-    results = [{
-        "pid": p["pid"],
-        "arrival": p["arrival"],
-        "burst": p["burst"],
-        "completion": p["completion"],
-        "turnaround": p["turnaround"],
-        "waiting": p["waiting"],
-        "response": p["response"]
-    } for p in processes]
+        seg_end[-1] = time
 
-    return gantt_chart, results
- 
+    return segments, first_start, last_start, completion
 
 
+def srtf(process_list, output="rows", switch_cost=0, estimate=None, stats=None):
+    table = as_process_table(process_list)
+    if estimate is not None:
+        _check_estimate(table, estimate)
+    if table.phases is not None:
+        return _run_blocking("srtf", table, output, switch_cost, stats=stats)
+    segments, _, last_start, completion = _run_preemptive(table, switch_cost=switch_cost, estimate=estimate,
+                                                          stats=stats)
+    return _output(table, segments, range(len(table)), completion, last_start, output)
+
 
-from collections import deque
 
-def round_robin(process_list, quantum):
-    processes = [
-        {"pid": p["pid"], "arrival": p["arrival"], "burst": p["burst"], "remaining": p["burst"]}
-        for p in process_list
-    ]
 
-    processes.sort(key=lambda x: x["arrival"])
+def _run_round_robin(table, quantum, switch_cost=0):
+    pids, arrival, order = table.pids, table.arrival, table.order
+    n = len(table)
+    remaining = list(table.burst)
+    started = [None] * n
+    completion = [None] * n
 
     time = 0
     queue = deque()
-    gantt_chart = []
+    segments = SegmentStore(time_typecode(table, quantum, switch_cost))
+    seg_idx, seg_start, seg_end = segments.pid_idx, segments.start, segments.end
     completed_count = 0
-    n = len(processes)
     last_pid = None
+    loaded = None
     i = 0
-    response_time = {p["pid"]: None for p in processes}
 
     while completed_count < n:
-        while i < n and processes[i]["arrival"] <= time:
-            queue.append(processes[i])
+        while i < n and arrival[order[i]] <= time:
+            queue.append(order[i])
             i += 1
 
         if not queue:
-            time += 1
+            time = max(time, arrival[order[i]])
             continue
 
-        current = queue.popleft()
-
-        if response_time[current["pid"]] is None:
-            response_time[current["pid"]] = time - current["arrival"]
-
-        if current["pid"] != last_pid:
-            gantt_chart.append({"pid": current["pid"], "start": time})
-            last_pid = current["pid"]
-
-        exec_time = min(quantum, current["remaining"])
-        current["remaining"] -= exec_time
+        j = queue.popleft()
+
+        if switch_cost and j != loaded:
+            time = _switch((seg_idx, seg_start, seg_end), time, switch_cost)
+            loaded = j
+            last_pid = None
+            while i < n and arrival[order[i]] <= time:
+                queue.append(order[i])
+                i += 1
+
+        if started[j] is None:
+            started[j] = time
+
+        if pids[j] != last_pid:
+            seg_idx.append(j)
+            seg_start.append(time)
+            seg_end.append(time)
+            last_pid = pids[j]
+
+        exec_time = min(quantum, remaining[j])
+        if not queue and remaining[j] > quantum:
+            # Alone on the CPU: it keeps being re-dispatched until the next
+            # arrival lands, so run all of those quanta in one step.
+            if i < n:
+                exec_time = min(remaining[j], -(-(arrival[order[i]] - time) // quantum) * quantum)
+            else:
+                exec_time = remaining[j]
+        remaining[j] -= exec_time
         time += exec_time
 
-        gantt_chart[-1]["end"] = time
+        seg_end[-1] = time
 
-        while i < n and processes[i]["arrival"] <= time:
-            queue.append(processes[i])
+        while i < n and arrival[order[i]] <= time:
+            queue.append(order[i])
             i += 1
 
-        if current["remaining"] == 0:
-            current["completion"] = time
-            current["turnaround"] = current["completion"] - current["arrival"]
-            current["waiting"] = current["turnaround"] - current["burst"]
-            current["response"] = response_time[current["pid"]]
+        if remaining[j] == 0:
+            completion[j] = time
             completed_count += 1
         else:
-            queue.append(current)
-
-    results = [{
-        "pid": p["pid"],
-        "arrival": p["arrival"],
-        "burst": p["burst"],
-        "completion": p["completion"],
-        "turnaround": p["turnaround"],
-        "waiting": p["waiting"],
-        "response": p["response"]
-    } for p in processes]
-
-    return gantt_chart, results
+            queue.append(j)
 
+    return segments, completion, started
 
 
+def round_robin(process_list, quantum, output="rows", switch_cost=0, stats=None):
+    table = as_process_table(process_list)
+    if table.phases is not None:
+        return _run_blocking("round_robin", table, output, switch_cost, quantum, stats)
+    segments, completion, started = _run_round_robin(table, quantum, switch_cost)
+    return _output(table, segments, table.order, completion, started, output)
 
-def priority_non_preemptive(process_list):
-    processes = sorted(process_list, key=lambda x: x["arrival"])
-    completed = []
-    gantt_chart = []
-    time = 0
-    n = len(processes)
-
-    while len(completed) < n:
-        available = [p for p in processes if p["arrival"] <= time and p not in completed]
-
-        if not available:
-            time += 1
-            continue
-
-        current = min(available, key=lambda x: x["priority"])
-        start = time
-        end = time + current["burst"]
 
-        gantt_chart.append({"pid": current["pid"], "start": start, "end": end})
 
-        current["completion"] = end
-        current["turnaround"] = end - current["arrival"]
-        current["waiting"] = current["turnaround"] - current["burst"]
-        current["response"] = start - current["arrival"]
 
-        completed.append(current)
-        time = end
+def priority_non_preemptive(process_list, output="rows", switch_cost=0, stats=None):
+    table = as_process_table(process_list)
+    if table.phases is not None:
+        return _run_blocking("priority_non_preemptive", table, output, switch_cost, stats=stats)
+    segments, rows, completion, started = _run_non_preemptive(table, table.priority, switch_cost, stats)
+    return _output(table, segments, rows, completion, started, output, extra="priority")
 
-    results = [{
-        "pid": p["pid"],
-        "arrival": p["arrival"],
-        "burst": p["burst"],
-        "priority": p["priority"],
-        "completion": p["completion"],
-        "turnaround": p["turnaround"],
-        "waiting": p["waiting"],
-        "response": p["response"]
-    } for p in completed]
 
-    return gantt_chart, results
 
 
+def priority_preemptive(process_list, output="rows", switch_cost=0, stats=None):
+    table = as_process_table(process_list)
+    if table.phases is not None:
+        return _run_blocking("priority_preemptive", table, output, switch_cost, stats=stats)
+    segments, first_start, _, completion = _run_preemptive(table, table.priority, switch_cost, stats=stats)
+    return _output(table, segments, range(len(table)), completion, first_start, output,
+                   extra="priority")
 
 
-def priority_preemptive(process_list):
-    processes = [
-        {"pid": p["pid"], "arrival": p["arrival"], "burst": p["burst"],
-         "priority": p["priority"], "remaining": p["burst"]}
-        for p in process_list
-    ]
 
-    time = 0
-    completed = 0
-    n = len(processes)
-    gantt_chart = []
-    last_pid = None
-    response = {p["pid"]: None for p in processes}
 
-    while completed < n:
-        available = [p for p in processes if p["arrival"] <= time and p["remaining"] > 0]
+MLFQ_QUANTA = (2, 4, 8)
 
-        if not available:
-            time += 1
-            continue
 
-        current = min(available, key=lambda x: x["priority"])
+def _next_event(arrival, order, i, blocked):
+    # Earliest pending arrival or I/O completion, None if there is neither.
+    t = arrival[order[i]] if i < len(order) else None
+    if blocked and (t is None or blocked[0][0] < t):
+        t = blocked[0][0]
+    return t
 
-        if current["pid"] != last_pid:
-            gantt_chart.append({"pid": current["pid"], "start": time})
-            last_pid = current["pid"]
 
-        if response[current["pid"]] is None:
-            response[current["pid"]] = time - current["arrival"]
+def _end_burst(table, phase, remaining, j, time, blocked, io, entry, heappush=heapq.heappush):
+    # j finished its current CPU burst at `time`.  Returns False when that
+    # was its last one; otherwise moves j onto its next CPU burst, records
+    # the I/O wait and pushes (wake time, *entry) onto the blocked heap.
+    if table.phases is None or phase[j] + 1 >= table.phase_start[j + 1]:
+        return False
+    wait = table.phases[phase[j] + 1]
+    phase[j] += 2
+    remaining[j] = table.phases[phase[j]]
+    io.pid_idx.append(j)
+    io.start.append(time)
+    io.end.append(time + wait)
+    heappush(blocked, (time + wait,) + entry)
+    return True
 
-        current["remaining"] -= 1
-        time += 1
-        gantt_chart[-1]["end"] = time
 
-        if current["remaining"] == 0:
-            current["completion"] = time
-            current["turnaround"] = time - current["arrival"]
-            current["waiting"] = current["turnaround"] - current["burst"]
-            current["response"] = response[current["pid"]]
-            completed += 1
+def _run_mlfq(table, quanta, boost, switch_cost=0, stats=None):
+    heappush, heappop = _heap_ops(stats)
+    arrival, order = table.arrival, table.order
+    n = len(table)
+    bottom = len(quanta) - 1
+    phase = list(table.phase_start[:-1]) if table.phases is not None else None
+    remaining = [table.phases[k] for k in phase] if phase is not None else list(table.burst)
+    # Blocked jobs: (wake time, seq, job, level to rejoin, time it blocked).
+    blocked = []
+    typecode = time_typecode(table, quanta, boost, switch_cost)
+    io = SegmentStore(typecode)
+    seq = 0
+    started = [None] * n
+    completion = [None] * n
+    used = [0] * n
+    queues = [deque() for _ in quanta]
+    queued = 0
+    segments = SegmentStore(typecode)
+    seg_idx, seg_start, seg_end = segments.pid_idx, segments.start, segments.end
+    next_boost = boost
+    loaded = None
+    time = 0
+    done = 0
+    i = 0
 
-    results = [{
-        "pid": p["pid"],
-        "arrival": p["arrival"],
-        "burst": p["burst"],
-        "priority": p["priority"],
-        "completion": p["completion"],
-        "turnaround": p["turnaround"],
-        "waiting": p["waiting"],
-        "response": p["response"]
-    } for p in processes]
+    while done < n:
+        while i < n and arrival[order[i]] <= time:
+            queues[0].append(order[i])
+            queued += 1
+            i += 1
+        while blocked and blocked[0][0] <= time:
+            wake, _, k, lvl, since = heappop(blocked)
+            if boost and wake // boost > since // boost:
+                # Boosted while it was blocked.
+                lvl = used[k] = 0
+            queues[lvl].append(k)
+            queued += 1
+
+        if boost and time >= next_boost:
+            for lower in queues[1:]:
+                for k in lower:
+                    used[k] = 0
+                queues[0].extend(lower)
+                lower.clear()
+            next_boost = (time // boost + 1) * boost
+
+        if not queued:
+            time = max(time, _next_event(arrival, order, i, blocked))
+            if boost and next_boost <= time:
+                next_boost = (time // boost + 1) * boost
+            continue
 
-    return gantt_chart, results
+        lvl = 0
+        while not queues[lvl]:
+            lvl += 1
+        j = queues[lvl].popleft()
+        if switch_cost and j != loaded:
+            # Atomic switch; anything arriving meanwhile may preempt j at once.
+            time = _switch((seg_idx, seg_start, seg_end), time, switch_cost)
+            loaded = j
+            queues[lvl].appendleft(j)
+            continue
+        queued -= 1
+        q = quanta[lvl]
+
+        if started[j] is None:
+            started[j] = time
+        if not (seg_idx and seg_idx[-1] == j and seg_end[-1] == time) or (io.end and io.pid_idx[-1] == j and io.end[-1] == time):
+            seg_idx.append(j)
+            seg_start.append(time)
+            seg_end.append(time)
+
+        # Alone at the bottom level, the job keeps its CPU until it finishes
+        # or something arrives, so skip the quantum-by-quantum requeueing.
+        solo = lvl == bottom and lvl > 0 and not queued
+        run = remaining[j] if solo else min(remaining[j], q - used[j])
+        if lvl > 0 and (i < n or blocked):
+            run = min(run, _next_event(arrival, order, i, blocked) - time)
+        if boost:
+            run = min(run, next_boost - time)
+        time += run
+        remaining[j] -= run
+        used[j] = (used[j] + run) % q if solo else used[j] + run
+        seg_end[-1] = time
+
+        while i < n and arrival[order[i]] <= time:
+            queues[0].append(order[i])
+            queued += 1
+            i += 1
 
+        if remaining[j] == 0:
+            if used[j] >= q:
+                used[j] = 0
+                lvl = min(lvl + 1, bottom)
+            if _end_burst(table, phase, remaining, j, time, blocked, io, (seq, j, lvl, time), heappush):
+                seq += 1
+            else:
+                completion[j] = time
+                done += 1
+        elif used[j] >= q:
+            used[j] = 0
+            queues[min(lvl + 1, bottom)].append(j)
+            queued += 1
+        else:
+            queues[lvl].appendleft(j)
+            queued += 1
+
+    return segments, completion, started, io
+
+
+def mlfq(process_list, quanta=MLFQ_QUANTA, boost=None, output="rows", switch_cost=0, stats=None):
+    """Multilevel feedback queue.
+
+    ``quanta`` gives one time slice per level, top level first.  New jobs
+    enter the top level, drop a level once they use up its slice, and are
+    preempted by anything arriving at a higher level.  Every ``boost`` time
+    units all jobs move back to the top level.  A job back from I/O
+    rejoins the level it left, keeping the slice it had used.
+    """
+    if not quanta or any(q <= 0 for q in quanta):
+        raise ValueError("mlfq needs at least one positive quantum")
+    if boost is not None and boost <= 0:
+        raise ValueError("boost interval must be positive")
+    table = as_process_table(process_list)
+    segments, completion, started, io = _run_mlfq(table, tuple(quanta), boost, switch_cost, stats)
+    return _output(table, segments, table.order, completion, started, output, io=io)
+
+
+CFS_LATENCY = 12
+CFS_MIN_GRANULARITY = 1
+
+
+def cfs_weight(priority):
+    # Like nice levels: priority 1 is weight 1024, each step is 1.25x.
+    return 1024 / 1.25 ** (priority - 1)
+
+
+def _run_cfs(table, latency, min_granularity, switch_cost=0, stats=None):
+    heappush, heappop = _heap_ops(stats)
+    arrival, order = table.arrival, table.order
+    n = len(table)
+    phase = list(table.phase_start[:-1]) if table.phases is not None else None
+    remaining = [table.phases[k] for k in phase] if phase is not None else list(table.burst)
+    blocked = []
+    typecode = time_typecode(table, min_granularity, switch_cost)
+    io = SegmentStore(typecode)
+    weight = [cfs_weight(p) for p in table.priority]
+    vruntime = [0.0] * n
+    started = [None] * n
+    completion = [None] * n
+    ready = []
+    total_weight = 0.0
+    min_vruntime = 0.0
+    segments = SegmentStore(typecode)
+    seg_idx, seg_start, seg_end = segments.pid_idx, segments.start, segments.end
+    seq = 0
+    loaded = None
+    time = 0
+    done = 0
+    i = 0
 
+    while done < n:
+        while i < n and arrival[order[i]] <= time:
+            j = order[i]
+            vruntime[j] = min_vruntime
+            heappush(ready, (min_vruntime, seq, j))
+            total_weight += weight[j]
+            seq += 1
+            i += 1
+        while blocked and blocked[0][0] <= time:
+            j = heappop(blocked)[2]
+            # A sleeper gets at most half a latency period of credit.
+            vruntime[j] = max(vruntime[j], min_vruntime - latency / 2)
+            heappush(ready, (vruntime[j], seq, j))
+            total_weight += weight[j]
+            seq += 1
+
+        if not ready:
+            time = max(time, _next_event(arrival, order, i, blocked))
+            continue
 
+        entry = heappop(ready)
+        j = entry[2]
+        if switch_cost and j != loaded:
+            time = _switch((seg_idx, seg_start, seg_end), time, switch_cost)
+            loaded = j
+            heappush(ready, entry)
+            continue
+        if started[j] is None:
+            started[j] = time
+        if not (seg_idx and seg_idx[-1] == j and seg_end[-1] == time) or (io.end and io.pid_idx[-1] == j and io.end[-1] == time):
+            seg_idx.append(j)
+            seg_start.append(time)
+            seg_end.append(time)
+
+        slice_ = max(min_granularity, int(latency * weight[j] / total_weight))
+        run = min(slice_, remaining[j])
+        if not ready and (i < n or blocked) and remaining[j] > slice_:
+            # Alone: run whole slices until the next arrival or wakeup is due.
+            run = min(remaining[j], -(-(_next_event(arrival, order, i, blocked) - time) // slice_) * slice_)
+        elif not ready:
+            run = remaining[j]
+        time += run
+        remaining[j] -= run
+        vruntime[j] += run * 1024 / weight[j]
+        seg_end[-1] = time
+
+        if remaining[j] == 0:
+            total_weight -= weight[j]
+            if _end_burst(table, phase, remaining, j, time, blocked, io, (seq, j), heappush):
+                seq += 1
+            else:
+                completion[j] = time
+                done += 1
+        else:
+            heappush(ready, (vruntime[j], seq, j))
+            seq += 1
+        if ready:
+            min_vruntime = max(min_vruntime, ready[0][0])
+
+    return segments, completion, started, io
+
+
+def cfs(process_list, latency=CFS_LATENCY, min_granularity=CFS_MIN_GRANULARITY, output="rows", switch_cost=0,
+        stats=None):
+    """Completely-fair-scheduler style policy.
+
+    The ready queue is a heap on virtual runtime, which advances more slowly
+    for heavier (higher-priority) jobs.  Each dispatch gets a whole-unit
+    share of ``latency`` proportional to its weight, but never less than
+    ``min_granularity``.  New jobs start at the queue's minimum vruntime;
+    jobs waking from I/O are lifted to at most ``latency / 2`` below it.
+    """
+    if latency <= 0 or min_granularity <= 0:
+        raise ValueError("latency and min_granularity must be positive")
+    table = as_process_table(process_list)
+    segments, completion, started, io = _run_cfs(table, latency, min_granularity, switch_cost, stats)
+    return _output(table, segments, table.order, completion, started, output, extra="priority", io=io)
+
+
+
+ALGORITHMS = {
+    "fcfs": fcfs,
+    "sjf_non_preemptive": sjf_non_preemptive,
+    "srtf": srtf,
+    "round_robin": round_robin,
+    "priority_non_preemptive": priority_non_preemptive,
+    "priority_preemptive": priority_preemptive,
+    "mlfq": mlfq,
+    "cfs": cfs,
+}
+
+
+def run_algorithm(name, process_list, quantum=None, output="rows", cores=1, policy="global", options=None,
+                  switch_cost=0, migration_cost=0, stats=None):
+    # options: keyword arguments for the tunable policies, e.g.
+    # {"quanta": (2, 4, 8), "boost": 50} for mlfq.  switch_cost is charged
+    # whenever a CPU loads a different process; migration_cost when a
+    # process resumes on another core (multi-core runs only).  stats: a
+    # dict the engine counts its heap operations into (engine.instrument).
+    if name not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {name!r}; expected one of {sorted(ALGORITHMS)}")
+    if switch_cost < 0 or migration_cost < 0:
+        raise ValueError("switch and migration costs cannot be negative")
+    if cores != 1:
+        from engine.multicore import run_multicore
+
+        return run_multicore(name, process_list, cores, quantum, policy=policy, output=output,
+                             switch_cost=switch_cost, migration_cost=migration_cost, stats=stats)
+    if name == "round_robin":
+        if quantum is None:
+            raise ValueError("round_robin needs a quantum")
+        return round_robin(process_list, quantum, output=output, switch_cost=switch_cost, stats=stats)
+    return ALGORITHMS[name](process_list, output=output, switch_cost=switch_cost, stats=stats, **(options or {}))
@@ -0,0 +1,204 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+from engine.algorithms import run_algorithm
+from engine.process_table import as_process_table
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 1024 * 1024 * 1024
+# Bump when cached results change shape for reasons the source hash below
+# cannot see (e.g. a dependency's dtype rules).
+CACHE_VERSION = 1
+_ENGINE_DIR = os.path.dirname(os.path.abspath(__file__))
+_engine_version = None
+
+
+def engine_version():
+    """``CACHE_VERSION`` plus a hash of the engine sources, so results cached
+    on disk by another build of the engines are never read back."""
+    global _engine_version
+    if _engine_version is None:
+        digest = hashlib.sha256(str(CACHE_VERSION).encode("ascii"))
+        for name in sorted(os.listdir(_ENGINE_DIR)):
+            if name.endswith(".py"):
+                with open(os.path.join(_ENGINE_DIR, name), "rb") as fh:
+                    digest.update(name.encode("utf-8") + b"\0" + fh.read())
+        _engine_version = digest.hexdigest()[:16]
+    return _engine_version
+
+
+def cache_key(table, name, quantum=None, output="rows", cores=1, policy="global", options=None,
+              switch_cost=0, migration_cost=0):
+    if name != "round_robin":
+        quantum = None
+    raw = f"{engine_version()}|{table.fingerprint}|{name}|{quantum!r}|{output}"
+    if cores != 1:
+        raw += f"|{cores}|{policy}"
+    if options:
+        raw += f"|{sorted(options.items())!r}"
+    if switch_cost or (migration_cost and cores != 1):
+        raw += f"|cost={switch_cost!r},{migration_cost!r}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _size_of(part):
+    if isinstance(part, dict):
+        return sum(getattr(v, "nbytes", sys.getsizeof(v)) for v in part.values())
+    if not part:
+        return sys.getsizeof(part)
+    # List of row dicts: all rows share a shape, so size one and scale.
+    first = part[0]
+    per_row = sys.getsizeof(first) + sum(sys.getsizeof(v) for v in first.values())
+    return sys.getsizeof(part) + per_row * len(part)
+
+
+def _freeze(value):
+    for part in value:
+        if isinstance(part, dict):
+            for column in part.values():
+                if hasattr(column, "flags"):
+                    column.flags.writeable = False
+    return value
+
+
+class SimulationCache:
+    """LRU cache of simulation results keyed by workload fingerprint.
+
+    Entries are evicted least-recently-used first once their estimated size
+    exceeds ``max_bytes``.  With ``directory`` set, results are also pickled
+    to disk and reloaded on a memory miss, so they survive restarts; files
+    there are deleted least-recently-used first once they pass
+    ``max_disk_bytes``.  Keys include ``engine_version()``, so a new build
+    of the engines never reads an old build's files.  Cached results are
+    shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, directory=None, max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def bytes_used(self):
+        return self._bytes
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _remember(self, key, value):
+        size = _size_of(value[0]) + _size_of(value[1])
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        if self.directory:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as fh:
+                    value = _freeze(pickle.load(fh))
+                os.utime(path)  # recently used, for _prune_disk
+            except (OSError, pickle.UnpicklingError, EOFError):
+                value = None
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, value)
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        value = _freeze(value)
+        with self._lock:
+            self._remember(key, value)
+        if self.directory:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self._path(key))
+            finally:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+            self._prune_disk()
+        return value
+
+    def _prune_disk(self):
+        # Oldest-used files first until the directory fits max_disk_bytes.
+        # Scanned each time, as other processes may share the directory.
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".pkl"):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    files.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            total -= size
+
+    def run(self, name, process_list, quantum=None, output="rows", cores=1, policy="global", options=None,
+            switch_cost=0, migration_cost=0):
+        table = as_process_table(process_list)
+        key = cache_key(table, name, quantum, output, cores, policy, options, switch_cost, migration_cost)
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, run_algorithm(name, table, quantum, output, cores, policy, options,
+                                                switch_cost, migration_cost))
+        return value
@@ -0,0 +1,85 @@
+# NumPy is imported on first use, so the row-mode engines stay pure stdlib
+# and start fast.
+np = None
+
+OUTPUT_MODES = ("rows", "columns")
+# Gantt pid index of context-switch / migration overhead segments.
+OVERHEAD = -1
+
+
+def require_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("output='columns' requires numpy") from None
+        np = numpy
+    return np
+
+
+def column_view(values):
+    # Zero-copy, read-only NumPy view of a ProcessTable column.
+    require_numpy()
+    dtype = np.int64 if values.typecode == "q" else np.float64
+    view = np.frombuffer(values, dtype=dtype)
+    view.flags.writeable = False
+    return view
+
+
+def _as_array(values):
+    arr = np.asarray(values)
+    if arr.dtype == object:
+        arr = arr.astype(np.float64)
+    return arr
+
+
+def build_columns(table, segments, rows, completion, started, extra=None, io=None):
+    require_numpy()
+    # segments and io are SegmentStores; the time columns become views of
+    # their buffers rather than copies.
+    gantt = {
+        "pid_idx": np.asarray(segments.pid_idx, dtype=np.int64),
+        "start": _as_array(segments.start),
+        "end": _as_array(segments.end),
+    }
+    if segments.core is not None:
+        gantt["core"] = np.asarray(segments.core, dtype=np.int64)
+    if table.phases is not None:
+        # I/O intervals follow the CPU segments, flagged by gantt["io"].
+        io_idx, io_start, io_end = (io.pid_idx, io.start, io.end) if io is not None else ((), (), ())
+        cpu = len(gantt["pid_idx"])
+        gantt["pid_idx"] = np.concatenate([gantt["pid_idx"], np.asarray(io_idx, dtype=np.int64)])
+        gantt["start"] = np.concatenate([gantt["start"], _as_array(io_start)])
+        gantt["end"] = np.concatenate([gantt["end"], _as_array(io_end)])
+        if "core" in gantt:
+            gantt["core"] = np.concatenate([gantt["core"], np.full(len(io_idx), -1, dtype=np.int64)])
+        gantt["io"] = np.arange(len(gantt["pid_idx"])) >= cpu
+
+    rows = np.asarray(rows, dtype=np.int64)
+    arrival = column_view(table.arrival)[rows]
+    burst = column_view(table.burst)[rows]
+    completion = _as_array(completion)[rows]
+    started = _as_array(started)[rows]
+
+    results = {"pid_idx": rows, "arrival": arrival, "burst": burst}
+    if table.phases is not None:
+        results["io"] = np.asarray(table.io_totals())[rows]
+    if extra == "priority":
+        results["priority"] = column_view(table.priority)[rows]
+    elif extra == "start":
+        results["start"] = started
+    results["completion"] = completion
+    results["turnaround"] = completion - arrival
+    results["waiting"] = results["turnaround"] - burst - results.get("io", 0)
+    results["response"] = started - arrival
+    return gantt, results
+
+
+def labelled(columns, pids):
+    # Swap the pid index for pid labels, ready for pd.DataFrame or export.
+    require_numpy()
+    labels = np.asarray(list(pids) + [None], dtype=object)  # OVERHEAD -> None
+    out = {"pid": labels[columns["pid_idx"]]}
+    out.update((k, v) for k, v in columns.items() if k != "pid_idx")
+    return out
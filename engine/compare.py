@@ -0,0 +1,116 @@
+import os
+
+from engine.algorithms import _run_round_robin, round_robin, run_algorithm
+from engine.cache import cache_key
+from engine.columns import OVERHEAD
+from engine.process_table import as_process_table
+
+# Below this many processes, pickling the table and results to workers costs
+# more than running the algorithms one after another.
+PARALLEL_MIN_PROCESSES = 20000
+
+
+def _run(args):
+    name, table, quantum, output, cores, policy, options, costs = args
+    return name, run_algorithm(name, table, quantum, output, cores, policy, options, *costs)
+
+
+def compare(process_list, algorithms, quantum=None, output="rows", max_workers=None,
+            executor=None, parallel_min_processes=PARALLEL_MIN_PROCESSES, cache=None,
+            cores=1, policy="global", options=None, switch_cost=0, migration_cost=0):
+    # options maps an algorithm name to its keyword arguments, e.g.
+    # {"mlfq": {"quanta": (2, 4, 8), "boost": 50}}.
+    table = as_process_table(process_list)
+    options = options or {}
+    costs = (switch_cost, migration_cost)
+    algorithms = list(dict.fromkeys(algorithms))
+    found = {}
+    if cache is not None:
+        for name in algorithms:
+            value = cache.get(cache_key(table, name, quantum, output, cores, policy, options.get(name), *costs))
+            if value is not None:
+                found[name] = value
+    jobs = [(name, table, quantum, output, cores, policy, options.get(name), costs) for name in algorithms if name not in found]
+
+    if max_workers is None:
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+    if not jobs:
+        computed = {}
+    elif executor is not None:
+        computed = dict(executor.map(_run, jobs))
+    elif len(jobs) < 2 or max_workers < 2 or len(table) < parallel_min_processes:
+        computed = dict(_run(job) for job in jobs)
+    else:
+        # Deferred: the process pool pulls in multiprocessing.
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            computed = dict(pool.map(_run, jobs))
+
+    if cache is not None:
+        for name, value in computed.items():
+            cache.put(cache_key(table, name, quantum, output, cores, policy, options.get(name), *costs), value)
+    found.update(computed)
+    return {name: found[name] for name in algorithms}
+
+
+def _sweep_chunk(args):
+    table, quanta, switch_cost = args
+    n = len(table)
+    base = sum(table.arrival)
+    work = sum(table.burst) + sum(table.io_totals())
+    rows = []
+    for quantum in quanta:
+        if table.phases is None:
+            store, completion, started = _run_round_robin(table, quantum, switch_cost)
+            segments = store.pid_idx, store.start, store.end
+            turnaround = sum(completion) - base
+            response = sum(started) - base
+        else:
+            # I/O phases need the event-driven engine; keep its CPU segments.
+            gantt, results = round_robin(table, quantum, switch_cost=switch_cost)
+            cpu = [(OVERHEAD if g["pid"] is None else 0, g["start"], g["end"]) for g in gantt if not g["io"]]
+            segments = tuple(zip(*cpu)) or ((), (), ())
+            turnaround = sum(r["turnaround"] for r in results)
+            response = sum(r["response"] for r in results)
+        overhead = [e - s for j, s, e in zip(*segments) if j == OVERHEAD]
+        rows.append((
+            quantum,
+            (turnaround - work) / n,
+            turnaround / n,
+            response / n,
+            max(len(segments[0]) - len(overhead) - 1, 0),
+            sum(overhead),
+        ))
+    return rows
+
+
+def round_robin_sweep(process_list, quanta, max_workers=None, executor=None,
+                      parallel_min_processes=PARALLEL_MIN_PROCESSES, switch_cost=0):
+    table = as_process_table(process_list)
+    quanta = list(dict.fromkeys(quanta))
+    if any(q <= 0 for q in quanta):
+        raise ValueError("quanta must be positive")
+    table.order  # sort once here so every worker receives the cached order
+    columns = {"quantum": [], "avg_waiting": [], "avg_turnaround": [], "avg_response": [],
+               "context_switches": [], "overhead_time": []}
+    if not quanta or not len(table):
+        return columns
+
+    if max_workers is None:
+        max_workers = min(len(quanta), os.cpu_count() or 1)
+    # One chunk of quanta per worker, so the table is pickled once per worker.
+    chunks = [(table, quanta[k::max(max_workers, 1)], switch_cost) for k in range(max(max_workers, 1))]
+    if executor is not None:
+        parts = list(executor.map(_sweep_chunk, chunks))
+    elif max_workers < 2 or len(table) < parallel_min_processes:
+        parts = [_sweep_chunk((table, quanta, switch_cost))]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            parts = list(pool.map(_sweep_chunk, chunks))
+
+    by_quantum = {row[0]: row for part in parts for row in part}
+    for quantum in quanta:
+        for key, value in zip(columns, by_quantum[quantum]):
+            columns[key].append(value)
+    return columns
@@ -0,0 +1,170 @@
+# Differential checks of the scheduling engines against engine.reference.
+#
+# Random workloads, biased towards ties (equal arrivals, bursts, priorities,
+# and arrivals landing exactly when a quantum expires), are run through the
+# frozen reference implementations and through a candidate module, by
+# default engine.algorithms.  Any difference in Gantt segments or metrics is
+# shrunk to a minimal workload before it is reported:
+#
+#     python -m engine.differential --trials 5000
+#     python -m engine.differential -a srtf -a round_robin --candidate my_fast_engine
+#
+# benchmarks.bench_engine runs a short fixed-seed check() before timing.
+
+import argparse
+import copy
+import importlib
+import json
+import random
+import sys
+
+from engine import reference
+
+ALGORITHMS = ("fcfs", "sjf_non_preemptive", "srtf", "round_robin", "priority_non_preemptive",
+              "priority_preemptive")
+# Numeric fields the shrinker reduces, with their smallest valid value.
+FIELDS = (("arrival", 0), ("burst", 1), ("priority", 1))
+
+
+def random_workload(rng, max_processes=8):
+    """A small integer workload as process dicts.  Ranges are drawn per
+    workload so some are all ties and some are spread out with idle gaps."""
+    n = rng.randint(1, max_processes)
+    span = rng.choice((0, 1, n, 3 * n, 10 * n))
+    burst = rng.choice((1, 3, 8))
+    levels = rng.choice((1, 2, 5))
+    return [{"pid": f"P{i + 1}", "arrival": rng.randint(0, span), "burst": rng.randint(1, burst),
+             "priority": rng.randint(1, levels)} for i in range(n)]
+
+
+def _first_difference(expected, actual, what):
+    if len(expected) != len(actual):
+        return f"{what}: {len(expected)} rows, candidate has {len(actual)}"
+    for k, (a, b) in enumerate(zip(expected, actual)):
+        if a != b:
+            return f"{what}[{k}]: {a} != {b}"
+    return None
+
+
+def mismatch(name, workload, quantum=None, candidate=None):
+    """How ``candidate`` (a module or mapping of algorithm functions, default
+    engine.algorithms) disagrees with the reference on one workload, as a
+    short message, or None when the schedules and metrics are identical."""
+    if candidate is None:
+        from engine import algorithms as candidate
+    run = candidate[name] if isinstance(candidate, dict) else getattr(candidate, name)
+    args = (quantum,) if name == "round_robin" else ()
+    # The reference writes results into the dicts it is given.
+    expected = getattr(reference, name)(copy.deepcopy(workload), *args)
+    given = copy.deepcopy(workload)
+    try:
+        actual = run(given, *args)
+    except Exception as exc:
+        return f"raised {type(exc).__name__}: {exc}"
+    if given != workload:
+        return "modified its input"
+    return (_first_difference(expected[0], actual[0], "gantt")
+            or _first_difference(expected[1], actual[1], "results"))
+
+
+def _smaller_values(value, floor):
+    for smaller in (floor, value // 2, value - 1):
+        if floor <= smaller < value:
+            yield smaller
+
+
+def _candidates(workload, quantum):
+    # Smaller variants of a failing case, most aggressive first.
+    n = len(workload)
+    size = n // 2
+    while size >= 1:
+        for start in range(0, n, size):
+            rest = workload[:start] + workload[start + size:]
+            if rest:
+                yield rest, quantum
+        size //= 2
+    if quantum is not None:
+        for q in _smaller_values(quantum, 1):
+            yield workload, q
+    # Every process at once first, which keeps ties between them.
+    for field, floor in FIELDS:
+        for step in (lambda v: v // 2, lambda v: v - 1):
+            changed = [dict(p, **{field: max(step(p[field]), floor)}) for p in workload]
+            if changed != workload:
+                yield changed, quantum
+    for k, process in enumerate(workload):
+        for field, floor in FIELDS:
+            for value in _smaller_values(process[field], floor):
+                changed = dict(process, **{field: value})
+                yield workload[:k] + [changed] + workload[k + 1:], quantum
+    renamed = [dict(p, pid=f"P{k + 1}") for k, p in enumerate(workload)]
+    if renamed != workload:
+        yield renamed, quantum
+
+
+def shrink(name, workload, quantum=None, candidate=None):
+    """Greedily reduce a failing workload (fewer processes, then a smaller
+    quantum, arrivals, bursts and priorities) while it still fails.
+    Returns ``(workload, quantum, message)`` for the smallest case found."""
+    message = mismatch(name, workload, quantum, candidate)
+    if message is None:
+        raise ValueError("the workload does not fail")
+    progress = True
+    while progress:
+        progress = False
+        for smaller, q in _candidates(workload, quantum):
+            found = mismatch(name, smaller, q, candidate)
+            if found is not None:
+                workload, quantum, message = smaller, q, found
+                progress = True
+                break
+    return workload, quantum, message
+
+
+def check(algorithms=ALGORITHMS, trials=2000, seed=0, max_processes=8, candidate=None):
+    """Compare ``candidate`` with the reference on ``trials`` random
+    workloads per algorithm.  Returns one shrunk failure per algorithm that
+    disagrees, as dicts with the trial, the minimal workload and quantum,
+    and what differed; an empty list means every schedule matched."""
+    failures = []
+    for name in algorithms:
+        for trial in range(trials):
+            rng = random.Random(f"{seed}:{name}:{trial}")
+            workload = random_workload(rng, max_processes)
+            quantum = rng.randint(1, 4) if name == "round_robin" else None
+            if mismatch(name, workload, quantum, candidate) is None:
+                continue
+            workload, quantum, message = shrink(name, workload, quantum, candidate)
+            failures.append({"algorithm": name, "trial": trial, "quantum": quantum,
+                             "workload": workload, "difference": message})
+            break
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare scheduling engines with the frozen reference implementations")
+    parser.add_argument("-a", "--algorithm", dest="algorithms", action="append", choices=ALGORITHMS,
+                        help="algorithm to check; repeat for several (default: all)")
+    parser.add_argument("--trials", type=int, default=2000, help="random workloads per algorithm")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-processes", type=int, default=8, help="largest random workload")
+    parser.add_argument("--candidate", default="engine.algorithms",
+                        help="module whose functions are checked (same names and signatures)")
+    args = parser.parse_args(argv)
+
+    candidate = importlib.import_module(args.candidate)
+    algorithms = args.algorithms or list(ALGORITHMS)
+    failures = check(algorithms, args.trials, args.seed, args.max_processes, candidate)
+    for failure in failures:
+        q = "" if failure["quantum"] is None else f" quantum={failure['quantum']}"
+        print(f"{failure['algorithm']}{q}: trial {failure['trial']} shrinks to {len(failure['workload'])} process(es)")
+        print(f"  {failure['difference']}")
+        print(f"  {json.dumps(failure['workload'])}")
+    if failures:
+        return 1
+    print(f"{len(algorithms)} algorithm(s) match the reference on {args.trials} workloads each")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
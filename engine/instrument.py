@@ -0,0 +1,127 @@
+import time
+
+from engine import algorithms
+from engine.columns import OVERHEAD
+from engine.process_table import as_process_table
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+def schedule_counters(table, segments, completion, io=None):
+    """Counters read off a finished schedule: ``dispatches`` (a CPU starting
+    a process), ``preemptions`` (a process leaving the CPU while still owing
+    work and not blocking on I/O), ``idle_jumps`` / ``idle_time`` (idle gaps
+    the event loop skipped, per core, where a tick loop would step through
+    every unit) and ``peak_ready`` (most processes waiting for a CPU at once).
+    ``segments`` and ``io`` are an engine's SegmentStores."""
+    pid_idx, start, end = segments.pid_idx, segments.start, segments.end
+    core = segments.core if segments.core is not None else [0] * len(pid_idx)
+    blocks = set(zip(io.pid_idx, io.start)) if io is not None else set()
+    dispatches = preemptions = idle_jumps = 0
+    idle_time = 0
+    free_at = {}
+    events = []
+    for j, s, e, c in zip(pid_idx, start, end, core):
+        last = free_at.get(c, 0)
+        if s > last:
+            idle_jumps += 1
+            idle_time += s - last
+        free_at[c] = max(last, e)
+        if j == OVERHEAD:
+            continue
+        dispatches += 1
+        if e != completion[j] and (j, e) not in blocks:
+            preemptions += 1
+        events.append((s, -1))
+        events.append((e, 1))
+    if io is not None:
+        events.extend((s, -1) for s in io.start)
+        events.extend((e, 1) for e in io.end)
+    events.extend((a, 1) for a in table.arrival)
+    events.extend((c, -1) for c in completion)
+    events.sort()
+    ready = peak = 0
+    for k, (t, delta) in enumerate(events):
+        ready += delta
+        # Counted once every event at t has been applied.
+        if (k + 1 == len(events) or events[k + 1][0] != t) and ready > peak:
+            peak = ready
+    return {"dispatches": dispatches, "preemptions": preemptions, "idle_jumps": idle_jumps,
+            "idle_time": idle_time, "peak_ready": peak}
+
+
+def _profiler(kind):
+    if kind == "cprofile":
+        import cProfile
+
+        return cProfile.Profile()
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        raise ImportError("profile='pyinstrument' requires pyinstrument") from None
+    return Profiler()
+
+
+def _profile_report(profiler, kind, lines):
+    if kind == "pyinstrument":
+        return profiler.output_text()
+    import io
+    import pstats
+
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(lines)
+    return out.getvalue()
+
+
+def run_instrumented(name, process_list, quantum=None, output="rows", cores=1, policy="global", options=None,
+                     switch_cost=0, migration_cost=0, profile=None, profile_lines=30):
+    """``run_algorithm`` with engine statistics: ``(gantt, results, stats)``.
+
+    ``stats`` holds ``schedule_counters``, the heap pushes and pops made by
+    the engine, and ``timings`` in seconds for building the process table,
+    the scheduling loop (with the counting overhead), building the output
+    and deriving the counters.
+    ``profile`` ("cprofile" or "pyinstrument") also profiles the run and
+    adds the report as ``stats["profile"]``.
+
+    The heap counters are a dict handed to the engine loop for this call
+    only, and the engine returns its raw schedule instead of an output, so
+    concurrent runs, instrumented or not, do not see each other.
+    """
+    if profile is not None and profile not in PROFILERS:
+        raise ValueError(f"profile must be one of {PROFILERS}, got {profile!r}")
+    counts = {"heap_pushes": 0, "heap_pops": 0}
+    timings = {}
+    t0 = time.perf_counter()
+    table = as_process_table(process_list)
+    table.order
+    timings["table"] = time.perf_counter() - t0
+
+    profiler = _profiler(profile) if profile else None
+    if profile == "pyinstrument":
+        profiler.start()
+    elif profile == "cprofile":
+        profiler.enable()
+    try:
+        t0 = time.perf_counter()
+        schedule = algorithms.run_algorithm(name, table, quantum, algorithms._SCHEDULE, cores, policy, options,
+                                            switch_cost, migration_cost, counts)
+        timings["schedule"] = time.perf_counter() - t0
+        table, segments, rows, completion, started, extra, io = schedule
+        t0 = time.perf_counter()
+        gantt, results = algorithms._output(table, segments, rows, completion, started, output, extra, io)
+        timings["output"] = time.perf_counter() - t0
+    finally:
+        if profile == "pyinstrument":
+            profiler.stop()
+        elif profile == "cprofile":
+            profiler.disable()
+
+    # Worked out after the run so they stay out of the profile.
+    t0 = time.perf_counter()
+    stats = dict(schedule_counters(table, segments, completion, io), **counts)
+    timings["counters"] = time.perf_counter() - t0
+    stats["timings"] = timings
+    if profiler is not None:
+        stats["profile"] = _profile_report(profiler, profile, profile_lines)
+    return gantt, results, stats
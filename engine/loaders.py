@@ -0,0 +1,221 @@
+import argparse
+import csv
+import io
+import json
+import math
+import os
+from array import array
+from itertools import islice
+
+from engine.process_table import ProcessTable
+
+DEFAULT_CHUNK_SIZE = 65536
+FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".json": "json"}
+
+
+def detect_format(name):
+    ext = os.path.splitext(str(name or ""))[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"cannot tell the scenario format of {name!r}; expected one of {sorted(FORMATS)}")
+    return FORMATS[ext]
+
+
+def _number(value, field, where):
+    if type(value) is int:
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            value = int(text)
+        except ValueError:
+            try:
+                value = float(text)
+            except ValueError:
+                raise ValueError(f"{where}: {field} must be a number, got {text!r}") from None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{where}: {field} must be a number, got {value!r}")
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f"{where}: {field} must be finite, got {value!r}")
+        if value.is_integer():
+            value = int(value)
+    return value
+
+
+def _bursts(value, where):
+    # CPU/I-O burst sequence: a list, or a string like "5;3;4" or "5 3 4".
+    if isinstance(value, str):
+        value = value.replace(";", " ").split()
+    if not isinstance(value, list) or len(value) % 2 == 0:
+        raise ValueError(f"{where}: bursts must alternate cpu, io, ..., cpu (an odd count), got {value!r}")
+    bursts = [_number(v, "bursts", where) for v in value]
+    if any(b <= 0 for b in bursts[::2]) or any(b < 0 for b in bursts[1::2]):
+        raise ValueError(f"{where}: CPU bursts must be > 0 and I/O bursts >= 0, got {bursts}")
+    return bursts
+
+
+def _record(record, where):
+    # Validate one raw record; returns (pid or None, arrival, burst, priority,
+    # bursts or None), where bursts is the CPU/I-O sequence if one was given.
+    if not isinstance(record, dict):
+        raise ValueError(f"{where}: expected an object, got {type(record).__name__}")
+    sequence = record.get("bursts")
+    sequence = None if sequence in (None, "") else _bursts(sequence, where)
+    for field in ("arrival",) if sequence else ("arrival", "burst"):
+        if record.get(field) in (None, ""):
+            raise ValueError(f"{where}: missing {field!r}")
+    arrival = _number(record["arrival"], "arrival", where)
+    if sequence:
+        burst = sum(sequence[::2])
+        if record.get("burst") not in (None, "") and _number(record["burst"], "burst", where) != burst:
+            raise ValueError(f"{where}: burst {record['burst']} does not match its CPU bursts ({burst})")
+    else:
+        burst = _number(record["burst"], "burst", where)
+    priority = record.get("priority")
+    priority = 1 if priority in (None, "") else _number(priority, "priority", where)
+    if arrival < 0:
+        raise ValueError(f"{where}: arrival must be >= 0, got {arrival}")
+    if burst <= 0:
+        raise ValueError(f"{where}: burst must be > 0, got {burst}")
+    pid = record.get("pid")
+    return (None if pid in (None, "") else str(pid)), arrival, burst, priority, sequence
+
+
+class _Columns:
+    # Growable arrays that start as int64 and widen to float64 on the first
+    # fractional value, so integer traces stay integer end to end.
+
+    def __init__(self):
+        self.pids = []
+        self.arrival = array("q")
+        self.burst = array("q")
+        self.priority = array("q")
+        # Filled in once the first record with "bursts" shows up.
+        self.phases = None
+        self.phase_start = None
+
+    def _extend(self, name, values):
+        column = getattr(self, name)
+        if column.typecode == "q" and any(isinstance(v, float) for v in values):
+            column = array("d", column)
+            setattr(self, name, column)
+        column.extend(values)
+
+    def add_chunk(self, chunk):
+        pids, arrivals, bursts, priorities, phases = [], [], [], [], []
+        for line_no, record in chunk:
+            pid, arrival, burst, priority, sequence = _record(record, f"record {line_no}")
+            pids.append(pid if pid is not None else f"P{len(self.pids) + len(pids) + 1}")
+            arrivals.append(arrival)
+            bursts.append(burst)
+            priorities.append(priority)
+            phases.append(sequence)
+        if self.phases is None and any(phases):
+            # Earlier records were single bursts.
+            self.phases = array(self.burst.typecode, self.burst)
+            self.phase_start = array("q", range(len(self.burst) + 1))
+        self.pids.extend(pids)
+        self._extend("arrival", arrivals)
+        self._extend("burst", bursts)
+        self._extend("priority", priorities)
+        if self.phases is not None:
+            flat, end = [], self.phase_start[-1]
+            for burst, sequence in zip(bursts, phases):
+                flat.extend(sequence or (burst,))
+                self.phase_start.append(end + len(flat))
+            self._extend("phases", flat)
+
+    def table(self):
+        return ProcessTable(self.pids, self.arrival, self.burst, self.priority, self.phases, self.phase_start)
+
+
+def _jsonl_chunks(fh, chunk_size):
+    line_no = 0
+    while True:
+        lines = list(islice(fh, chunk_size))
+        if not lines:
+            return
+        chunk = []
+        for line in lines:
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                chunk.append((line_no, json.loads(line)))
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"line {line_no}: invalid JSON ({exc.msg})") from None
+        yield chunk
+
+
+def _csv_chunks(fh, chunk_size):
+    reader = csv.DictReader(fh)
+    if reader.fieldnames is None:
+        return
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    while True:
+        rows = list(islice(reader, chunk_size))
+        if not rows:
+            return
+        yield [(reader.line_num - len(rows) + k + 1, row) for k, row in enumerate(rows)]
+
+
+def _json_chunks(fh, chunk_size):
+    # Plain JSON lists are parsed whole; kept for the scenarios the UI saves.
+    loaded = json.load(fh)
+    if not isinstance(loaded, list):
+        raise ValueError("a .json scenario must be a list of processes")
+    for k in range(0, len(loaded), chunk_size):
+        yield [(k + m + 1, rec) for m, rec in enumerate(loaded[k:k + chunk_size])]
+
+
+_READERS = {"jsonl": _jsonl_chunks, "csv": _csv_chunks, "json": _json_chunks}
+
+
+def iter_records(source, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of (line number, raw record) pairs, one chunk at a time."""
+    fmt = fmt or detect_format(getattr(source, "name", source))
+    if fmt not in _READERS:
+        raise ValueError(f"unknown scenario format {fmt!r}")
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding="utf-8", newline="") as fh:
+            yield from _READERS[fmt](fh, chunk_size)
+        return
+    if isinstance(source.read(0), bytes):
+        source = io.TextIOWrapper(source, encoding="utf-8", newline="")
+    yield from _READERS[fmt](source, chunk_size)
+
+
+def load_workload(source, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Parse a JSON Lines, CSV or JSON scenario into a ProcessTable.
+
+    ``source`` is a path or an open (text or binary) file.  Records are read
+    ``chunk_size`` at a time and appended straight into typed columns, so
+    peak memory is one chunk of records plus the final arrays.
+    """
+    columns = _Columns()
+    for chunk in iter_records(source, fmt, chunk_size):
+        columns.add_chunk(chunk)
+    return columns.table()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate a scenario file and print a summary")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=sorted(_READERS), default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    try:
+        table = load_workload(args.path, args.format, args.chunk_size)
+    except (OSError, ValueError) as exc:
+        parser.exit(1, f"error: {exc}\n")
+    n = len(table)
+    print(f"processes: {n}")
+    if n:
+        print(f"arrivals:  {min(table.arrival)} .. {max(table.arrival)}")
+        print(f"total burst: {sum(table.burst)}")
+        if table.phases is not None:
+            print(f"total io:    {sum(table.io_totals())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+from engine.algorithms import _heap_ops, _output
+from engine.columns import OVERHEAD
+from engine.process_table import as_process_table
+from engine.segments import SegmentStore, time_typecode
+
+MULTICORE_ALGORITHMS = ("fcfs", "sjf_non_preemptive", "srtf", "round_robin",
+                        "priority_non_preemptive", "priority_preemptive")
+POLICIES = ("global", "per_core")
+
+
+def run_multicore(name, process_list, cores, quantum=None, policy="global", output="rows",
+                  switch_cost=0, migration_cost=0, stats=None):
+    """Simulate ``name`` on ``cores`` identical CPUs.
+
+    ``policy="global"`` keeps one shared ready queue.  ``"per_core"`` gives
+    each core its own queue, places arrivals round-robin across cores, and
+    lets an idle core steal from the longest queue.  Gantt segments carry
+    the core that ran them.  Response time is measured to the first
+    dispatch for every algorithm.
+
+    A core pays ``switch_cost`` whenever it loads a different process, plus
+    ``migration_cost`` when that process last ran on another core.  The
+    overhead is drawn as OVERHEAD segments, and a core cannot be preempted
+    while it switches.
+
+    Processes with several CPU bursts block for the I/O between them and
+    rejoin the ready queue (their last core's, under ``per_core``) when it
+    completes.  SJF and SRTF rank a process by its current CPU burst.
+
+    ``stats``, a dict with "heap_pushes" and "heap_pops", counts the heap
+    operations of the run (see engine.instrument).
+    """
+    if name not in MULTICORE_ALGORITHMS:
+        raise ValueError(f"unknown algorithm {name!r}; expected one of {MULTICORE_ALGORITHMS}")
+    if policy not in POLICIES:
+        raise ValueError(f"policy must be one of {POLICIES}, got {policy!r}")
+    if int(cores) != cores or cores < 1:
+        raise ValueError("cores must be a positive integer")
+    heappush, heappop = _heap_ops(stats)
+    rr = name == "round_robin"
+    if rr and (quantum is None or quantum <= 0):
+        raise ValueError("round_robin needs a positive quantum")
+
+    table = as_process_table(process_list)
+    arrival, burst, priority, order = table.arrival, table.burst, table.priority, table.order
+    n = len(table)
+    cores = int(cores)
+    per_core = policy == "per_core"
+    preemptive = name in ("srtf", "priority_preemptive")
+
+    phases, phase_start = table.phases, table.phase_start
+    # phase[j]: index into `phases` of j's current CPU burst.
+    phase = list(phase_start[:-1]) if phases is not None else None
+    remaining = [phases[k] for k in phase] if phases is not None else list(burst)
+    blocked = []
+    typecode = time_typecode(table, quantum, switch_cost, migration_cost)
+    io = SegmentStore(typecode)
+    io_idx, io_start, io_end = io.pid_idx, io.start, io.end
+    first_start = [None] * n
+    completion = [None] * n
+    last_core = [None] * n
+    done = []
+
+    queues = [[] for _ in range(cores if per_core else 1)]
+    queued = 0
+    seq = 0
+    # Max-heaps of running processes per queue, used to find the one to preempt.
+    running_rank = [[] for _ in queues]
+    running = [None] * cores
+    switching = [False] * cores
+    loaded = [None] * cores
+    run_start = [0] * cores
+    run_len = [0] * cores
+    version = [0] * cores
+    events = []
+    free = set(range(cores))
+    free_heap = list(range(cores))
+
+    segments = SegmentStore(typecode, cores=True)
+    seg_idx, seg_start, seg_end, seg_core = segments.pid_idx, segments.start, segments.end, segments.core
+    core_seg = [-1] * cores
+
+    def push(q, j):
+        nonlocal seq, queued
+        if name in ("srtf", "priority_preemptive"):
+            entry = (remaining[j] if name == "srtf" else priority[j], j, j)
+        elif name == "sjf_non_preemptive":
+            entry = (remaining[j], seq, j)
+        elif name == "priority_non_preemptive":
+            entry = (priority[j], seq, j)
+        else:
+            entry = (seq, 0, j)
+        seq += 1
+        queued += 1
+        heappush(queues[q], entry)
+
+    def pop(q):
+        nonlocal queued
+        queued -= 1
+        return heappop(queues[q])[2]
+
+    def start(c, j, t):
+        overhead = switch_cost if j != loaded[c] else 0
+        if migration_cost and last_core[j] is not None and last_core[j] != c:
+            overhead += migration_cost
+        last_core[j] = c
+        loaded[c] = j
+        running[c] = j
+        free.discard(c)
+        if not overhead:
+            begin(c, t)
+            return
+        seg_idx.append(OVERHEAD)
+        seg_start.append(t)
+        seg_end.append(t + overhead)
+        seg_core.append(c)
+        core_seg[c] = len(seg_idx) - 1
+        switching[c] = True
+        version[c] += 1
+        heappush(events, (t + overhead, c, version[c]))
+
+    def begin(c, t):
+        j = running[c]
+        switching[c] = False
+        if first_start[j] is None:
+            first_start[j] = t
+        k = core_seg[c]
+        if k < 0 or seg_idx[k] != j or seg_end[k] != t:
+            seg_idx.append(j)
+            seg_start.append(t)
+            seg_end.append(t)
+            seg_core.append(c)
+            core_seg[c] = len(seg_idx) - 1
+        run_start[c] = t
+        version[c] += 1
+        run = min(quantum, remaining[j]) if rr else remaining[j]
+        run_len[c] = run
+        heappush(events, (t + run, c, version[c]))
+        if preemptive:
+            rank = (t + remaining[j], j) if name == "srtf" else (priority[j], j)
+            heappush(running_rank[c if per_core else 0], (-rank[0], -rank[1], c, version[c]))
+
+    def stop(c, t):
+        j = running[c]
+        # Charge a full slice exactly: with fractional times t - run_start
+        # can miss it by a rounding error and leave a sliver of work.
+        remaining[j] -= run_len[c] if t == run_start[c] + run_len[c] else t - run_start[c]
+        seg_end[core_seg[c]] = t
+        running[c] = None
+        version[c] += 1
+        free.add(c)
+        heappush(free_heap, c)
+        return j
+
+    def take_free(preferred):
+        if preferred is not None and preferred in free:
+            return preferred
+        while free_heap[0] not in free:
+            heappop(free_heap)
+        return free_heap[0]
+
+    def running_key(c, t):
+        j = running[c]
+        if name == "srtf":
+            return (remaining[j] - (t - run_start[c]), j)
+        return (priority[j], j)
+
+    def worst_running(q):
+        heap = running_rank[q]
+        while heap and heap[0][3] != version[heap[0][2]]:
+            heappop(heap)
+        return heap[0][2] if heap else None
+
+    i = 0
+    while len(done) < n:
+        while events and events[0][2] != version[events[0][1]]:
+            heappop(events)
+        if events and (i >= n or events[0][0] <= arrival[order[i]]):
+            t = events[0][0]
+        elif i < n:
+            t = arrival[order[i]]
+        elif not blocked:
+            break
+        else:
+            t = blocked[0][0]
+        if blocked and blocked[0][0] < t:
+            t = blocked[0][0]
+
+        requeue = []
+        touched = set()
+        while events and events[0][0] <= t:
+            _, c, v = heappop(events)
+            if v != version[c]:
+                continue
+            if switching[c] and preemptive:
+                # Like the single-core engines, re-pick once the switch ends:
+                # something better may have arrived meanwhile.
+                j = running[c]
+                switching[c] = False
+                running[c] = None
+                version[c] += 1
+                free.add(c)
+                heappush(free_heap, c)
+                push(c if per_core else 0, j)
+                touched.add(c if per_core else 0)
+                continue
+            if switching[c]:
+                begin(c, t)
+                continue
+            j = stop(c, t)
+            if remaining[j] == 0 and phases is not None and phase[j] + 1 < phase_start[j + 1]:
+                wait = phases[phase[j] + 1]
+                phase[j] += 2
+                remaining[j] = phases[phase[j]]
+                io_idx.append(j)
+                io_start.append(t)
+                io_end.append(t + wait)
+                heappush(blocked, (t + wait, seq, j))
+                seq += 1
+                core_seg[c] = -1  # never coalesce across a zero-length wait
+            elif remaining[j] == 0:
+                completion[j] = t
+                done.append(j)
+            else:
+                requeue.append((c, j))
+
+        while i < n and arrival[order[i]] <= t:
+            q = i % cores if per_core else 0
+            push(q, order[i])
+            touched.add(q)
+            i += 1
+        while blocked and blocked[0][0] <= t:
+            j = heappop(blocked)[2]
+            q = last_core[j] if per_core else 0
+            push(q, j)
+            touched.add(q)
+        for c, j in requeue:
+            q = c if per_core else 0
+            push(q, j)
+            touched.add(q)
+
+        if per_core:
+            for q in sorted(touched):
+                if q in free and queues[q]:
+                    start(q, pop(q), t)
+            if queued and free:
+                for c in sorted(free):
+                    if not queued:
+                        break
+                    q = c if queues[c] else max(range(cores), key=lambda k: len(queues[k]))
+                    start(c, pop(q), t)
+        else:
+            while queued and free:
+                j = pop(0)
+                start(take_free(last_core[j]), j, t)
+
+        if preemptive and queued:
+            for q in (sorted(touched) if per_core else (0,)):
+                while queues[q]:
+                    c = q if per_core else worst_running(q)
+                    if c is None or running[c] is None or switching[c]:
+                        break
+                    best = queues[q][0]
+                    if (best[0], best[1]) >= running_key(c, t):
+                        break
+                    push(q, stop(c, t))
+                    start(c, pop(q), t)
+
+    if name in ("sjf_non_preemptive", "priority_non_preemptive"):
+        rows = done
+    elif preemptive:
+        rows = range(n)
+    else:
+        rows = order
+    extra = "start" if name == "fcfs" else ("priority" if "priority" in name else None)
+    return _output(table, segments, rows, completion, first_start, output, extra=extra, io=io)
@@ -0,0 +1,425 @@
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import stat
+import sys
+import threading
+from collections import deque
+
+from engine.loaders import _number, _record
+from engine.multicore import MULTICORE_ALGORITHMS
+
+ONLINE_ALGORITHMS = MULTICORE_ALGORITHMS
+DEFAULT_HISTORY = 1000
+
+
+class _Job:
+    __slots__ = ("pid", "arrival", "burst", "priority", "phases", "phase", "remaining", "io", "first_start")
+
+    def __init__(self, pid, arrival, burst, priority, phases):
+        self.pid = pid
+        self.arrival = arrival
+        self.burst = burst
+        self.priority = priority
+        self.phases = phases
+        self.phase = 0
+        self.remaining = phases[0] if phases else burst
+        self.io = sum(phases[1::2]) if phases else 0
+        self.first_start = None
+
+
+class OnlineScheduler:
+    """Single-core scheduler fed one process at a time.
+
+    ``submit`` queues a process (a dict shaped like a scenario record) that
+    arrives at or after the current clock.  ``advance_to(t)`` is a generator
+    that runs the simulation up to ``t`` and yields ``("segment", seg)`` and
+    ``("completion", row)`` events as they happen; the clock only moves as
+    it is iterated.  Decisions at ``t`` itself wait for the next call, so a
+    process arriving exactly at ``t`` can still be submitted.  ``close()``
+    ends the feed and ``drain()`` runs everything left.
+
+    Scheduling matches ``run_multicore(name, ..., cores=1)``, and rows and
+    segments have the same fields, with ``io`` on every one of them once a
+    process with I/O phases has been submitted.  Finished processes are
+    folded into running totals; only the last ``history`` segments and
+    completions are kept, for ``snapshot()``.
+    """
+
+    def __init__(self, name, quantum=None, switch_cost=0, history=DEFAULT_HISTORY):
+        if name not in ONLINE_ALGORITHMS:
+            raise ValueError(f"online scheduling supports {ONLINE_ALGORITHMS}, got {name!r}")
+        if name == "round_robin" and (quantum is None or quantum <= 0):
+            raise ValueError("round_robin needs a positive quantum")
+        if switch_cost < 0:
+            raise ValueError("switch cost cannot be negative")
+        self.name = name
+        self.quantum = quantum
+        self.switch_cost = switch_cost
+        self.preemptive = name in ("srtf", "priority_preemptive")
+        self.time = 0
+        self.closed = False
+        self._phased = False
+        self._jobs = {}
+        self._submitted = 0
+        self._seq = 0
+        self._pending = []
+        self._blocked = []
+        self._ready = []
+        self._running = None
+        self._switching = False
+        self._loaded = None
+        self._run_start = 0
+        self._run_len = 0
+        self._event = None
+        # (job or None for switch overhead, segment) not yet emitted.
+        self._open = None
+        self.segments = deque(maxlen=history)
+        self.completions = deque(maxlen=history)
+        self._done = 0
+        self._busy = 0
+        self._overhead = 0
+        self._totals = {"waiting": 0, "turnaround": 0, "response": 0}
+        self._max_waiting = 0
+
+    def submit(self, process):
+        if self.closed:
+            raise ValueError("the feed is closed")
+        record = dict(process)
+        if record.get("arrival") in (None, ""):
+            record["arrival"] = self.time
+        pid, arrival, burst, priority, phases = _record(record, f"process {self._submitted + 1}")
+        if arrival < self.time:
+            raise ValueError(f"process {pid} arrives at {arrival}, before the clock ({self.time})")
+        k = self._submitted
+        self._submitted += 1
+        self._jobs[k] = _Job(pid if pid is not None else f"P{k + 1}", arrival, burst, priority, phases)
+        self._phased = self._phased or bool(phases)
+        heapq.heappush(self._pending, (arrival, k))
+        return self._jobs[k].pid
+
+    def close(self):
+        self.closed = True
+
+    def next_event(self):
+        # Time of the next scheduling decision, or None when nothing is left.
+        times = [t for t in (self._event,
+                             self._pending[0][0] if self._pending else None,
+                             self._blocked[0][0] if self._blocked else None) if t is not None]
+        return min(times) if times else None
+
+    def advance_to(self, t):
+        if t < self.time:
+            raise ValueError(f"cannot go back from {self.time} to {t}")
+        while True:
+            now = self.next_event()
+            if now is None or now >= t:
+                break
+            self.time = now
+            yield from self._step(now)
+        self.time = t
+
+    def drain(self):
+        self.close()
+        while True:
+            now = self.next_event()
+            if now is None:
+                return
+            self.time = now
+            yield from self._step(now)
+
+    def snapshot(self):
+        running = self._jobs[self._running].pid if self._running is not None and not self._switching else None
+        busy = self._busy
+        if self._open is not None and self._open[0] is not None:
+            seg = self._open[1]
+            busy += (self.time if running is not None else seg["end"]) - seg["start"]
+        done = self._done
+        return {
+            "time": self.time,
+            "running": running,
+            "ready": len(self._ready),
+            "blocked": len(self._blocked),
+            "pending": len(self._pending),
+            "completed": done,
+            "avg_waiting": self._totals["waiting"] / done if done else None,
+            "avg_turnaround": self._totals["turnaround"] / done if done else None,
+            "avg_response": self._totals["response"] / done if done else None,
+            "max_waiting": self._max_waiting if done else None,
+            "cpu_utilisation": busy / self.time if self.time > 0 else None,
+            "overhead_time": self._overhead,
+            "throughput": done / self.time if self.time > 0 else None,
+        }
+
+    # Scheduling, one decision time at a time; same order as run_multicore.
+
+    def _key(self, k):
+        job = self._jobs[k]
+        if self.name == "srtf":
+            return (job.remaining, k, k)
+        if self.name == "priority_preemptive":
+            return (job.priority, k, k)
+        self._seq += 1
+        if self.name == "sjf_non_preemptive":
+            return (job.remaining, self._seq, k)
+        if self.name == "priority_non_preemptive":
+            return (job.priority, self._seq, k)
+        return (self._seq, 0, k)
+
+    def _flush(self):
+        if self._open is None:
+            return ()
+        (k, seg), self._open = self._open, None
+        if k is None:
+            self._overhead += seg["end"] - seg["start"]
+        else:
+            self._busy += seg["end"] - seg["start"]
+        if self._phased:
+            seg["io"] = False
+        self.segments.append(seg)
+        return (("segment", seg),)
+
+    def _start(self, k, t):
+        overhead = self.switch_cost if k != self._loaded else 0
+        self._loaded = k
+        self._running = k
+        if not overhead:
+            return self._begin(t)
+        events = list(self._flush())
+        self._open = (None, {"pid": None, "start": t, "end": t + overhead})
+        self._switching = True
+        self._event = t + overhead
+        return events
+
+    def _begin(self, t):
+        events = []
+        k = self._running
+        job = self._jobs[k]
+        self._switching = False
+        if job.first_start is None:
+            job.first_start = t
+        if self._open is None or self._open[0] != k or self._open[1]["end"] != t:
+            events.extend(self._flush())
+            self._open = (k, {"pid": job.pid, "start": t, "end": t})
+        self._run_start = t
+        run = min(self.quantum, job.remaining) if self.name == "round_robin" else job.remaining
+        self._run_len = run
+        self._event = t + run
+        return events
+
+    def _stop(self, t):
+        k = self._running
+        # A full slice is charged exactly; see engine.multicore.
+        end = self._run_start + self._run_len
+        self._jobs[k].remaining -= self._run_len if t == end else t - self._run_start
+        self._open[1]["end"] = t
+        self._running = None
+        self._event = None
+        return k
+
+    def _step(self, t):
+        events = []
+        requeue = None
+        if self._event is not None and self._event <= t:
+            if self._switching and self.preemptive:
+                # Re-pick once the switch ends; something better may be ready.
+                k = self._running
+                self._switching = False
+                self._running = None
+                self._event = None
+                heapq.heappush(self._ready, self._key(k))
+            elif self._switching:
+                events.extend(self._begin(t))
+            else:
+                k = self._stop(t)
+                job = self._jobs[k]
+                if job.remaining == 0 and job.phases and job.phase + 1 < len(job.phases):
+                    wait = job.phases[job.phase + 1]
+                    job.phase += 2
+                    job.remaining = job.phases[job.phase]
+                    events.extend(self._flush())
+                    seg = {"pid": job.pid, "start": t, "end": t + wait, "io": True}
+                    self.segments.append(seg)
+                    events.append(("segment", seg))
+                    heapq.heappush(self._blocked, (t + wait, self._seq, k))
+                    self._seq += 1
+                elif job.remaining == 0:
+                    events.extend(self._flush())
+                    events.append(("completion", self._complete(k, t)))
+                else:
+                    requeue = k
+
+        while self._pending and self._pending[0][0] <= t:
+            heapq.heappush(self._ready, self._key(heapq.heappop(self._pending)[1]))
+        while self._blocked and self._blocked[0][0] <= t:
+            heapq.heappush(self._ready, self._key(heapq.heappop(self._blocked)[2]))
+        if requeue is not None:
+            heapq.heappush(self._ready, self._key(requeue))
+
+        if self._running is None and self._ready:
+            events.extend(self._start(heapq.heappop(self._ready)[2], t))
+        if self.preemptive and self._ready and self._running is not None and not self._switching:
+            job = self._jobs[self._running]
+            if self.name == "srtf":
+                current = (job.remaining - (t - self._run_start), self._running)
+            else:
+                current = (job.priority, self._running)
+            if self._ready[0][:2] < current:
+                heapq.heappush(self._ready, self._key(self._stop(t)))
+                events.extend(self._start(heapq.heappop(self._ready)[2], t))
+        if self._running is None:
+            events.extend(self._flush())
+        yield from events
+
+    def _complete(self, k, t):
+        job = self._jobs.pop(k)
+        row = {"pid": job.pid, "arrival": job.arrival, "burst": job.burst}
+        if self._phased:
+            row["io"] = job.io
+        if self.name == "fcfs":
+            row["start"] = job.first_start
+        elif "priority" in self.name:
+            row["priority"] = job.priority
+        row["completion"] = t
+        row["turnaround"] = t - job.arrival
+        row["waiting"] = row["turnaround"] - job.burst - job.io
+        row["response"] = job.first_start - job.arrival
+        self._done += 1
+        for key in self._totals:
+            self._totals[key] += row[key]
+        self._max_waiting = max(self._max_waiting, row["waiting"])
+        self.completions.append(row)
+        return row
+
+
+class _FileFeed:
+    # readline() for regular files, which the event loop cannot poll; lines
+    # are read in blocks on a worker thread.
+
+    def __init__(self, path):
+        self._fh = open(path, "rb")
+        self._lines = deque()
+
+    async def readline(self):
+        if not self._lines:
+            loop = asyncio.get_running_loop()
+            self._lines.extend(await loop.run_in_executor(None, self._fh.readlines, 1 << 16))
+            if not self._lines:
+                self._fh.close()
+                return b""
+        return self._lines.popleft()
+
+
+class _SocketFeed:
+    # Holds on to the writer: dropping it would close the connection.
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    async def readline(self):
+        line = await self._reader.readline()
+        if not line:
+            self._writer.close()
+        return line
+
+
+def _parse_source(source):
+    # "unix:/path", "tcp:host:port", or a path to a named pipe or file.
+    if source.startswith("unix:"):
+        return "unix", source[5:]
+    if source.startswith("tcp:"):
+        host, _, port = source[4:].rpartition(":")
+        return "tcp", (host or "127.0.0.1", int(port))
+    return "path", source
+
+
+async def open_feed(source):
+    """Open a live arrival feed; returns an object with ``await readline()``."""
+    kind, address = _parse_source(source)
+    if kind == "unix":
+        return _SocketFeed(*await asyncio.open_unix_connection(address))
+    if kind == "tcp":
+        return _SocketFeed(*await asyncio.open_connection(*address))
+    if not stat.S_ISFIFO(os.stat(address).st_mode):
+        return _FileFeed(address)
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    # Opening a FIFO blocks until a writer shows up.  A daemon thread does
+    # it, so a caller that gives up waiting is not held at exit.
+    opened = loop.create_future()
+
+    def opener():
+        try:
+            pipe = open(address, "rb", buffering=0)
+        except OSError as exc:
+            loop.call_soon_threadsafe(opened.set_exception, exc)
+        else:
+            loop.call_soon_threadsafe(opened.set_result, pipe)
+
+    threading.Thread(target=opener, daemon=True).start()
+    pipe = await opened
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    return reader
+
+
+async def run_feed(scheduler, reader):
+    """Feed JSON Lines from ``reader`` into ``scheduler``.
+
+    An async generator of the scheduler's events.  Each line is a process
+    record (``arrival`` defaults to the current clock), or
+    ``{"advance": t}`` to move the clock without a new arrival.  Records
+    must arrive in time order.  At end of feed everything left is drained.
+    """
+    line_no = 0
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"line {line_no}: invalid JSON ({exc.msg})") from None
+        where = f"line {line_no}"
+        if isinstance(record, dict) and set(record) == {"advance"}:
+            for event in scheduler.advance_to(_number(record["advance"], "advance", where)):
+                yield event
+            continue
+        if isinstance(record, dict) and record.get("arrival") not in (None, ""):
+            for event in scheduler.advance_to(max(scheduler.time, _number(record["arrival"], "arrival", where))):
+                yield event
+        scheduler.submit(record)
+    for event in scheduler.drain():
+        yield event
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule a live arrival feed and print events as they happen")
+    parser.add_argument("source", help="named pipe or file of JSON Lines, unix:/path/to/socket or tcp:host:port")
+    parser.add_argument("-a", "--algorithm", choices=ONLINE_ALGORITHMS, default="fcfs")
+    parser.add_argument("-q", "--quantum", type=int, default=2)
+    parser.add_argument("--switch-cost", type=float, default=0.0)
+    parser.add_argument("--summary-only", action="store_true", help="print only the final snapshot")
+    args = parser.parse_args(argv)
+    switch_cost = int(args.switch_cost) if args.switch_cost.is_integer() else args.switch_cost
+    scheduler = OnlineScheduler(args.algorithm, args.quantum, switch_cost)
+
+    async def consume():
+        async for kind, item in run_feed(scheduler, await open_feed(args.source)):
+            if not args.summary_only:
+                print(json.dumps({"event": kind, **item}), flush=True)
+
+    try:
+        asyncio.run(consume())
+    except (OSError, ValueError) as exc:
+        parser.exit(1, f"error: {exc}\n")
+    print(json.dumps({"event": "snapshot", **scheduler.snapshot()}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import hashlib
+from array import array
+
+
+def _column(values):
+    if isinstance(values, array) and values.typecode in ("q", "d"):
+        return values
+    kind = getattr(getattr(values, "dtype", None), "kind", None)
+    if kind in ("i", "u", "b"):
+        # NumPy integer/float arrays: copy the raw buffer instead of boxing
+        # every element through a Python list.
+        return array("q", values.astype("int64").tobytes())
+    if kind == "f":
+        return array("d", values.astype("float64").tobytes())
+    values = list(values)
+    if all(isinstance(v, int) for v in values):
+        return array("q", values)
+    return array("d", values)
+
+
+class ProcessTable:
+    """Read-only column store for a workload.
+
+    Row ``i`` is the process labelled ``pids[i]``; the row number doubles as
+    the pid index used by the engines.  Columns are ``array`` objects, so a
+    table costs a few dozen bytes per process instead of a dict each.
+
+    Processes that alternate CPU and I/O keep their bursts in ``phases``, a
+    flat column laid out cpu, io, cpu, ... per process, with process ``i``
+    at ``phases[phase_start[i]:phase_start[i + 1]]``.  ``burst`` is then the
+    total CPU time.  Both are None when every process is a single burst.
+    """
+
+    __slots__ = ("pids", "arrival", "burst", "priority", "phases", "phase_start", "_order", "_fingerprint")
+
+    def __init__(self, pids, arrival, burst, priority=None, phases=None, phase_start=None):
+        self.pids = tuple(pids)
+        self.arrival = _column(arrival)
+        self.burst = _column(burst)
+        self.priority = _column(priority if priority is not None else [1] * len(self.pids))
+        self.phases = None if phases is None else _column(phases)
+        self.phase_start = None if phase_start is None else array("q", _column(phase_start))
+        self._order = None
+        self._fingerprint = None
+        if not (len(self.pids) == len(self.arrival) == len(self.burst) == len(self.priority)):
+            raise ValueError("ProcessTable columns must have the same length")
+        if (self.phases is None) != (self.phase_start is None):
+            raise ValueError("phases and phase_start go together")
+        if self.phases is not None:
+            bounds = self.phase_start
+            if len(bounds) != len(self.pids) + 1 or bounds[0] != 0 or bounds[-1] != len(self.phases):
+                raise ValueError("phase_start must hold len(pids) + 1 offsets into phases")
+            if any((b - a) % 2 == 0 for a, b in zip(bounds, bounds[1:])):
+                raise ValueError("each process needs an odd number of phases: cpu, io, cpu, ..., cpu")
+
+    @classmethod
+    def from_dicts(cls, process_list):
+        if not any("bursts" in p for p in process_list):
+            return cls(
+                [p["pid"] for p in process_list],
+                [p["arrival"] for p in process_list],
+                [p["burst"] for p in process_list],
+                [p.get("priority", 1) for p in process_list],
+            )
+        phases, phase_start, burst = [], [0], []
+        for p in process_list:
+            bursts = p.get("bursts") or [p["burst"]]
+            cpu = sum(bursts[::2])
+            if p.get("burst") is not None and p["burst"] != cpu:
+                raise ValueError(f"{p['pid']}: burst {p['burst']} does not match its CPU bursts ({cpu})")
+            phases.extend(bursts)
+            phase_start.append(len(phases))
+            burst.append(cpu)
+        return cls(
+            [p["pid"] for p in process_list],
+            [p["arrival"] for p in process_list],
+            burst,
+            [p.get("priority", 1) for p in process_list],
+            phases,
+            phase_start,
+        )
+
+    def __len__(self):
+        return len(self.pids)
+
+    def __iter__(self):
+        for i in range(len(self.pids)):
+            yield self.row(i)
+
+    def row(self, i):
+        row = {"pid": self.pids[i], "arrival": self.arrival[i],
+               "burst": self.burst[i], "priority": self.priority[i]}
+        if self.phases is not None:
+            row["bursts"] = self.bursts(i)
+        return row
+
+    def bursts(self, i):
+        # CPU and I/O bursts of process i, starting and ending with CPU.
+        if self.phases is None:
+            return [self.burst[i]]
+        return self.phases[self.phase_start[i]:self.phase_start[i + 1]].tolist()
+
+    def io_totals(self):
+        # Total I/O time per process.
+        if self.phases is None:
+            return [0] * len(self.pids)
+        phases, bounds = self.phases, self.phase_start
+        return [sum(phases[a + 1:b:2]) for a, b in zip(bounds, bounds[1:])]
+
+    def to_dicts(self):
+        return list(self)
+
+    @property
+    def order(self):
+        # Stable arrival order, shared by every algorithm run on this table.
+        if self._order is None:
+            arrival = self.arrival
+            self._order = array("q", sorted(range(len(self.pids)), key=arrival.__getitem__))
+        return self._order
+
+    @property
+    def fingerprint(self):
+        # Content hash of the workload; equal tables give equal fingerprints.
+        if self._fingerprint is None:
+            h = hashlib.sha256()
+            h.update("\x1f".join(map(str, self.pids)).encode("utf-8"))
+            for column in (self.arrival, self.burst, self.priority, self.phases, self.phase_start):
+                if column is None:
+                    continue
+                h.update(column.typecode.encode("ascii"))
+                h.update(column.tobytes())
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+
+def as_process_table(processes):
+    if isinstance(processes, ProcessTable):
+        return processes
+    return ProcessTable.from_dicts(processes)
@@ -0,0 +1,201 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from numbers import Integral
+
+from engine.columns import require_numpy
+
+# Narrowest array typecodes tried by SegmentStore.from_columns.
+_INT_TYPECODES = ("h", "i", "q")
+
+
+def time_typecode(table, *durations):
+    """Array typecode for the times an engine produces: ``"q"`` when
+    ``table`` and every duration (quantum, switch cost, ...; tuples and None
+    allowed) are whole numbers, ``"d"`` otherwise."""
+    columns = (table.arrival, table.burst) + ((table.phases,) if table.phases is not None else ())
+    if any(column.typecode != "q" for column in columns):
+        return "d"
+    for value in durations:
+        for v in value if isinstance(value, tuple) else (value,):
+            # Zero costs never enter the arithmetic.
+            if v and not isinstance(v, Integral):
+                return "d"
+    return "q"
+
+
+def _narrowest(values):
+    kind = values.dtype.kind
+    if kind == "b":
+        return "b"
+    if kind == "f":
+        return "d"
+    lo, hi = (int(values.min()), int(values.max())) if values.size else (0, 0)
+    for typecode in _INT_TYPECODES:
+        bits = array(typecode).itemsize * 8 - 1
+        if -(1 << bits) <= lo and hi < 1 << bits:
+            return typecode
+    return "q"
+
+
+class SegmentStore:
+    """Compact Gantt segments as parallel ``array`` columns.
+
+    ``pid_idx`` holds the process row (OVERHEAD for switch time), ``start``
+    and ``end`` the times, and ``core`` / ``io`` are there only for
+    multi-core runs and charts with I/O waits.  A segment costs 20-24 bytes
+    instead of a dict or three boxed list entries.  The engines append to
+    the columns directly and coalesce as they go, extending the last
+    segment of a process that keeps its CPU; ``append`` does the same for
+    other callers.  Segments are kept in start order.
+    """
+
+    __slots__ = ("pid_idx", "start", "end", "core", "io", "_reach")
+
+    def __init__(self, typecode="q", cores=False, io=False, core_typecode="i"):
+        self.pid_idx = array("i")
+        self.start = array(typecode)
+        self.end = array(typecode)
+        self.core = array(core_typecode) if cores else None
+        self.io = array("b") if io else None
+        self._reach = None
+
+    @classmethod
+    def from_columns(cls, gantt):
+        # Columnar engine output in the narrowest types that hold it, e.g.
+        # to keep many runs around in a UI session, sorted by start.
+        np = require_numpy()
+        if np.any(np.diff(gantt["start"]) < 0):
+            # I/O waits come after the CPU segments in engine output.
+            order = np.argsort(gantt["start"], kind="stable")
+            gantt = {name: column[order] for name, column in gantt.items()}
+        times = np.concatenate([gantt["start"], gantt["end"]])
+        store = cls(_narrowest(times), "core" in gantt, "io" in gantt,
+                    _narrowest(gantt["core"]) if "core" in gantt else "i")
+        for name in cls.__slots__[:-1]:
+            column = getattr(store, name)
+            if column is not None:
+                column.frombytes(np.ascontiguousarray(gantt[name], dtype=column.typecode).tobytes())
+        return store
+
+    def __getstate__(self):
+        # The bisect index is rebuilt on demand rather than pickled.
+        return {name: getattr(self, name) for name in self.__slots__[:-1]}
+
+    def __setstate__(self, state):
+        for name, column in state.items():
+            setattr(self, name, column)
+        self._reach = None
+
+    def __len__(self):
+        return len(self.pid_idx)
+
+    @property
+    def nbytes(self):
+        return sum(c.itemsize * len(c) for c in (self.pid_idx, self.start, self.end, self.core, self.io) if c is not None)
+
+    def append(self, j, start, end, core=None, io=False):
+        # Extend the last segment when it is j on the same lane, ending at `start`.
+        k = len(self.pid_idx) - 1
+        if (k >= 0 and self.pid_idx[k] == j and self.end[k] == start
+                and (self.core is None or self.core[k] == core) and (self.io is None or self.io[k] == io)):
+            self.end[k] = end
+            return
+        self.pid_idx.append(j)
+        self.start.append(start)
+        self.end.append(end)
+        if self.core is not None:
+            self.core.append(core)
+        if self.io is not None:
+            self.io.append(io)
+
+    def to_columns(self):
+        """Read-only NumPy views of the columns, keyed like columnar engine
+        output ("io" as a bool mask)."""
+        np = require_numpy()
+        gantt = {}
+        for name in self.__slots__[:-1]:
+            column = getattr(self, name)
+            if column is None:
+                continue
+            view = np.frombuffer(column, dtype=column.typecode)
+            if name == "io":
+                view = view.view(bool)
+            view.flags.writeable = False
+            gantt[name] = view
+        return gantt
+
+    def _reach_index(self):
+        # Running maximum of the ends, so a bisect finds the first segment
+        # that can still be open at t although ends are out of order across
+        # cores and I/O waits.  Built on the first query after growth.
+        if self._reach is None or len(self._reach) != len(self.end):
+            self._reach = array(self.end.typecode, accumulate(self.end, max))
+        return self._reach
+
+    def _take(self, rows):
+        out = SegmentStore(self.start.typecode, self.core is not None, self.io is not None,
+                           self.core.typecode if self.core is not None else "i")
+        for name in self.__slots__[:-1]:
+            column = getattr(self, name)
+            if column is not None:
+                getattr(out, name).extend(column[k] for k in rows)
+        return out
+
+    def segments_between(self, t0, t1):
+        """Segments overlapping [t0, t1), as a new store, in O(log n + k)."""
+        lo = bisect_right(self._reach_index(), t0)
+        hi = bisect_left(self.start, t1, lo)
+        end = self.end
+        return self._take([k for k in range(lo, hi) if end[k] > t0])
+
+    def summary(self, t0, t1, buckets):
+        """Level-of-detail view of [t0, t1) for drawing ``buckets`` wide.
+
+        Segments at least one bucket long are kept.  Shorter ones are merged
+        per bucket and lane (core, with I/O waits apart from CPU time) into
+        one segment spanning them, labelled with the process that ran
+        longest in it.  Returns a store of at most a few segments per bucket
+        and lane, whatever the length of the trace.
+        """
+        window = self.segments_between(t0, t1)
+        width = (t1 - t0) / buckets if buckets > 0 else 0
+        if width <= 0:
+            return window
+        core, io = window.core, window.io
+        kept = []
+        open_bucket = {}
+
+        def close(lane):
+            bucket, start, end, share = open_bucket.pop(lane)
+            kept.append((start, max(share, key=share.get), end, lane))
+
+        for k, (j, s, e) in enumerate(zip(window.pid_idx, window.start, window.end)):
+            lane = (core[k] if core is not None else None, io[k] if io is not None else 0)
+            if e - s >= width:
+                kept.append((s, j, e, lane))
+                continue
+            bucket = int((s - t0) // width)
+            current = open_bucket.get(lane)
+            if current is not None and current[0] != bucket:
+                close(lane)
+                current = None
+            if current is None:
+                current = open_bucket[lane] = [bucket, s, e, {}]
+            current[2] = max(current[2], e)
+            current[3][j] = current[3].get(j, 0) + (e - s)
+        for lane in list(open_bucket):
+            close(lane)
+
+        kept.sort(key=lambda seg: seg[0])
+        out = SegmentStore(self.start.typecode, core is not None, io is not None,
+                           core.typecode if core is not None else "i")
+        for s, j, e, (c, flag) in kept:
+            out.pid_idx.append(j)
+            out.start.append(s)
+            out.end.append(e)
+            if core is not None:
+                out.core.append(c)
+            if io is not None:
+                out.io.append(flag)
+        return out
@@ -0,0 +1,196 @@
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, islice
+
+from engine.columns import OVERHEAD
+
+
+def _values(column):
+    return column.tolist() if hasattr(column, "tolist") else list(column)
+
+
+class _MaxTree:
+    # Segment tree of maxima over ends[], for intervals sorted by start:
+    # stab(t, hi) walks rows k < hi with ends[k] > t left to right, pruning
+    # every subtree whose ends are all <= t, so each row it yields costs
+    # O(log n) however many earlier intervals are still open.
+    def __init__(self, ends):
+        level = list(ends)
+        levels = [level]
+        while len(level) > 1:
+            if len(level) % 2:
+                level.append(float("-inf"))
+            level = list(map(max, level[0::2], level[1::2]))
+            levels.append(level)
+        self._levels = levels[::-1]  # root first
+
+    def stab(self, t, hi):
+        levels = self._levels
+        leaf = len(levels) - 1
+        stack = [(0, 0)] if levels[0] else []
+        while stack:
+            depth, k = stack.pop()
+            if levels[depth][k] <= t or k << (leaf - depth) >= hi:
+                continue
+            if depth == leaf:
+                yield k
+                continue
+            stack.append((depth + 1, 2 * k + 1))
+            stack.append((depth + 1, 2 * k))
+
+
+def _open_at(starts, ends, t):
+    # Index of the interval containing t among non-overlapping sorted ones.
+    k = bisect_right(starts, t) - 1
+    return k if k >= 0 and ends[k] > t else None
+
+
+class Timeline:
+    """Point-in-time view of a finished run.
+
+    Built once from the run's SegmentStore (which must include its I/O
+    waits, as stored from columnar output) and its columnar results.  CPU
+    segments are indexed per core, where they never overlap, so
+    ``running``, ``remaining`` and the counts in ``state`` take O(c log n)
+    on c cores.  Who is blocked comes from a segment tree over the I/O
+    waits in O((k + 1) log n) for k answers; ``ready`` walks the arrived,
+    unfinished processes the same way and also passes over the ones
+    running or blocked before its ``limit`` is reached.  Times are
+    half-open: a process whose segment ends at t is no longer running at t.
+    """
+
+    def __init__(self, segments, results):
+        pid_idx = _values(segments.pid_idx)
+        start, end = _values(segments.start), _values(segments.end)
+        core = _values(segments.core) if segments.core is not None else [0] * len(pid_idx)
+        io = _values(segments.io) if segments.io is not None else [False] * len(pid_idx)
+        cpu = [k for k in range(len(pid_idx)) if not io[k]]
+        wait = [k for k in range(len(pid_idx)) if io[k]]
+
+        self._pid = [pid_idx[k] for k in cpu]
+        self._core = [core[k] for k in cpu]
+        self._start = [start[k] for k in cpu]
+        self._end = [end[k] for k in cpu]
+        # Per core: start and end of each non-empty segment, and its row.
+        lanes = {}
+        for k, (c, s, e) in enumerate(zip(self._core, self._start, self._end)):
+            if e > s:
+                lane = lanes.get(c)
+                if lane is None:
+                    lane = lanes[c] = ([], [], [])
+                lane[0].append(s)
+                lane[1].append(e)
+                lane[2].append(k)
+        self._lanes = [lanes[c] for c in sorted(lanes)]
+        # served[k]: CPU time given to processes by segments before k.
+        self._served = [0] + list(accumulate(
+            e - s if j != OVERHEAD else 0 for j, s, e in zip(self._pid, self._start, self._end)))
+
+        self._io_pid = [pid_idx[k] for k in wait]
+        self._io_start = [start[k] for k in wait]
+        self._io_end = [end[k] for k in wait]
+        self._io_tree = _MaxTree(self._io_end)
+        self._io_end_sorted = sorted(self._io_end)
+        # The I/O waits again, by process and then start (the sort is
+        # stable); one process' waits never overlap.  Flat lists rather than
+        # one per process keep the garbage collector out of it.
+        by_pid = sorted(range(len(wait)), key=self._io_pid.__getitem__)
+        self._wait_pid = [self._io_pid[k] for k in by_pid]
+        self._wait_start = [self._io_start[k] for k in by_pid]
+        self._wait_end = [self._io_end[k] for k in by_pid]
+
+        rows = _values(results["pid_idx"])
+        arrival, burst = _values(results["arrival"]), _values(results["burst"])
+        completion = _values(results["completion"])
+        order = sorted(range(len(rows)), key=arrival.__getitem__)
+        self._proc = [rows[r] for r in order]
+        self._arrival = [arrival[r] for r in order]
+        self._completion = [completion[r] for r in order]
+        self._alive_tree = _MaxTree(self._completion)
+        self._completion_sorted = sorted(completion)
+        self._arrived_work = [0] + list(accumulate(burst[r] for r in order))
+        self._burst = dict(zip(rows, burst))
+        self._by_pid = None
+
+        self.end = max(self._completion + self._end + self._io_end, default=0)
+
+    def _open(self, t):
+        # Rows of the CPU segments open at t, one per busy core, in core order.
+        open_ = []
+        for starts, ends, rows in self._lanes:
+            k = _open_at(starts, ends, t)
+            if k is not None:
+                open_.append(rows[k])
+        return open_
+
+    def running(self, t):
+        """(core, pid index) on the CPU at t, in core order; OVERHEAD marks
+        a switch."""
+        return [(self._core[k], self._pid[k]) for k in self._open(t)]
+
+    def blocked(self, t):
+        """Pid indices waiting on I/O at t, in the order their waits began."""
+        return [self._io_pid[k] for k in self._io_tree.stab(t, bisect_right(self._io_start, t))]
+
+    def _waiting_io(self, j, t):
+        lo = bisect_left(self._wait_pid, j)
+        k = bisect_right(self._wait_start, t, lo, bisect_right(self._wait_pid, j, lo)) - 1
+        return k >= lo and self._wait_end[k] > t
+
+    def ready(self, t, limit=None):
+        """Pid indices that have arrived and wait for a CPU at t, in arrival
+        order; only the first ``limit`` when given."""
+        on_cpu = {j for _, j in self.running(t)}
+        alive = (self._proc[r] for r in self._alive_tree.stab(t, bisect_right(self._arrival, t)))
+        waiting = (j for j in alive if j not in on_cpu and not self._waiting_io(j, t))
+        return list(islice(waiting, limit))
+
+    def _served_by(self, t):
+        # CPU time handed out before t, and the running segments at t.
+        open_ = self._open(t)
+        served = self._served[bisect_right(self._start, t)]
+        served -= sum(self._end[k] - t for k in open_ if self._pid[k] != OVERHEAD)
+        return served, open_
+
+    def remaining(self, t, j=None):
+        """CPU work still owed at t: to everything that has arrived, or to
+        process ``j`` alone."""
+        if j is None:
+            return self._arrived_work[bisect_right(self._arrival, t)] - self._served_by(t)[0]
+        if self._by_pid is None:
+            # Each process' segments in time order, with served-time prefixes.
+            by_pid = {}
+            for s, e, k in sorted((s, e, k) for s, e, k in zip(self._start, self._end, self._pid) if k != OVERHEAD):
+                by_pid.setdefault(k, ([], [], [0]))
+                starts, ends, served = by_pid[k]
+                starts.append(s)
+                ends.append(e)
+                served.append(served[-1] + e - s)
+            self._by_pid = by_pid
+        starts, ends, served = self._by_pid.get(j, ((), (), (0,)))
+        k = bisect_right(starts, t)
+        done = served[k] - (ends[k - 1] - t if k and ends[k - 1] > t else 0)
+        return self._burst[j] - done
+
+    def state(self, t, limit=None):
+        """Snapshot at t for an inspector: the running processes and counts
+        of arrived, completed, ready and blocked ones (O(c log n)), the
+        outstanding work, and up to ``limit`` ready pid indices, found
+        without listing the rest."""
+        served, open_ = self._served_by(t)
+        arrived = bisect_right(self._arrival, t)
+        completed = bisect_right(self._completion_sorted, t)
+        blocked = bisect_right(self._io_start, t) - bisect_right(self._io_end_sorted, t)
+        # A process being switched in still counts as ready.
+        on_cpu = sum(1 for k in open_ if self._pid[k] != OVERHEAD)
+        state = {
+            "time": t,
+            "running": [(self._core[k], self._pid[k]) for k in open_],
+            "arrived": arrived,
+            "completed": completed,
+            "ready": arrived - completed - on_cpu - blocked,
+            "blocked": blocked,
+            "remaining": self._arrived_work[arrived] - served,
+        }
+        if limit:
+            state["ready_pids"] = self.ready(t, limit)
+        return state
@@ -0,0 +1,108 @@
+from engine.columns import require_numpy
+from engine.process_table import ProcessTable
+
+ARRIVALS = ("poisson", "bursty", "diurnal")
+BURSTS = ("exponential", "lognormal", "pareto", "uniform")
+PRIORITY_MIXES = ("uniform", "skewed", "bimodal", "constant")
+
+# Bursty arrivals come in clusters of about this many processes, spaced
+# tightly inside a cluster and widely between clusters.
+CLUSTER_SIZE = 20
+INTRA_CLUSTER_GAP = 0.1
+
+
+def _arrivals(rng, n, kind, rate, period):
+    np = require_numpy()
+    if kind == "poisson":
+        return np.cumsum(rng.exponential(1 / rate, n))
+    if kind == "bursty":
+        sizes = rng.geometric(1 / CLUSTER_SIZE, n)
+        first = np.zeros(n, dtype=bool)
+        starts = np.cumsum(sizes) - sizes
+        first[starts[starts < n]] = True
+        # Keep the long-run rate: a cluster of CLUSTER_SIZE spans CLUSTER_SIZE / rate.
+        gap_between = (CLUSTER_SIZE - (CLUSTER_SIZE - 1) * INTRA_CLUSTER_GAP) / rate
+        gaps = np.where(first, rng.exponential(gap_between, n), rng.exponential(INTRA_CLUSTER_GAP / rate, n))
+        return np.cumsum(gaps)
+    if kind == "diurnal":
+        # Rate rate * (1 + 0.8 sin(2 pi t / period)), sampled by mapping a
+        # unit-rate Poisson process through the inverse cumulative intensity.
+        unit = np.cumsum(rng.exponential(1.0, n))
+        if period is None:
+            period = n / rate / 4
+        amp = 0.8
+        t = np.linspace(0.0, unit[-1] / rate, 1 << 16)
+        cumulative = rate * (t + amp * period / (2 * np.pi) * (1 - np.cos(2 * np.pi * t / period)))
+        return np.interp(unit, cumulative, t)
+    raise ValueError(f"unknown arrival process {kind!r}; expected one of {ARRIVALS}")
+
+
+def _bursts(rng, n, kind, mean):
+    np = require_numpy()
+    if kind == "exponential":
+        values = rng.exponential(mean, n)
+    elif kind == "lognormal":
+        sigma = 1.0
+        values = rng.lognormal(np.log(mean) - sigma ** 2 / 2, sigma, n)
+    elif kind == "pareto":
+        alpha = 1.5
+        values = (rng.pareto(alpha, n) + 1) * mean * (alpha - 1) / alpha
+    elif kind == "uniform":
+        values = rng.integers(1, 2 * mean, n)
+    else:
+        raise ValueError(f"unknown burst distribution {kind!r}; expected one of {BURSTS}")
+    return np.maximum(np.rint(values), 1).astype(np.int64)
+
+
+def _priorities(rng, n, kind, levels):
+    np = require_numpy()
+    if kind == "uniform":
+        return rng.integers(1, levels + 1, n)
+    if kind == "skewed":
+        # Each level is twice as common as the one above it (1 is most urgent).
+        weights = 2.0 ** np.arange(levels)
+        return rng.choice(np.arange(1, levels + 1), n, p=weights / weights.sum())
+    if kind == "bimodal":
+        # A fifth of the work is interactive (priority 1), the rest batch.
+        return np.where(rng.random(n) < 0.2, 1, levels)
+    if kind == "constant":
+        return np.ones(n, dtype=np.int64)
+    raise ValueError(f"unknown priority mix {kind!r}; expected one of {PRIORITY_MIXES}")
+
+
+def generate_workload(n, arrival="poisson", burst="exponential", priority="uniform", seed=0,
+                      mean_burst=10, load=0.9, priority_levels=5, period=None, cpu_bursts=1, mean_io=None):
+    """Reproducible synthetic workload as a ProcessTable.
+
+    ``load`` is the offered CPU load (mean CPU time per process x arrival
+    rate): below 1 the CPU idles between bursts, above 1 the ready queue
+    keeps growing.  With ``cpu_bursts`` > 1 every process alternates that
+    many CPU bursts (each of mean ``mean_burst``) with exponential I/O waits
+    of mean ``mean_io`` (default 2 x ``mean_burst``).  The same arguments
+    and ``seed`` always produce the same table.
+    """
+    if n < 0:
+        raise ValueError("n must be >= 0")
+    if mean_burst < 1 or load <= 0 or priority_levels < 1:
+        raise ValueError("mean_burst must be >= 1, load > 0 and priority_levels >= 1")
+    if cpu_bursts < 1 or (mean_io is not None and mean_io < 1):
+        raise ValueError("cpu_bursts and mean_io must be >= 1")
+    np = require_numpy()
+    rng = np.random.default_rng(seed)
+    if n == 0:
+        return ProcessTable([], [], [], [])
+    rate = load / (mean_burst * cpu_bursts)
+    arrivals = np.floor(_arrivals(rng, n, arrival, rate, period)).astype(np.int64)
+    arrivals -= arrivals[0]
+    pids = [f"P{i}" for i in range(1, n + 1)]
+    if cpu_bursts == 1:
+        return ProcessTable(pids, arrivals, _bursts(rng, n, burst, mean_burst),
+                            _priorities(rng, n, priority, priority_levels))
+    width = 2 * cpu_bursts - 1
+    phases = np.empty((n, width), dtype=np.int64)
+    phases[:, ::2] = _bursts(rng, n * cpu_bursts, burst, mean_burst).reshape(n, cpu_bursts)
+    priorities = _priorities(rng, n, priority, priority_levels)
+    waits = rng.exponential(mean_io or 2 * mean_burst, (n, cpu_bursts - 1))
+    phases[:, 1::2] = np.maximum(np.rint(waits), 1)
+    return ProcessTable(pids, arrivals, phases[:, ::2].sum(axis=1), priorities,
+                        phases.ravel(), np.arange(0, n * width + 1, width))
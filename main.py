@@ -0,0 +1,255 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from engine.algorithms import ALGORITHMS, run_algorithm
+from engine.instrument import PROFILERS, run_instrumented
+from engine.loaders import load_workload
+from engine.multicore import MULTICORE_ALGORITHMS, POLICIES
+from engine.workloads import generate_workload
+
+OUTPUT_FORMATS = ("csv", "json", "parquet")
+GENERATED_PREFIX = "gen:"
+
+
+def _write_rows(rows, path, fmt):
+    if fmt == "json":
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(rows, fh)
+    elif fmt == "parquet":
+        import pandas as pd
+
+        pd.DataFrame(rows).to_parquet(path, index=False)
+    else:
+        fields = list(dict.fromkeys(k for row in rows for k in row))
+        with open(path, "w", encoding="utf-8", newline="") as fh:
+            writer = csv.DictWriter(fh, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def _runs(algorithms, quanta):
+    for name in algorithms:
+        if name == "round_robin":
+            for q in quanta:
+                yield name, q
+        else:
+            yield name, None
+
+
+def parse_generated(spec):
+    # "gen:n=100000,arrival=bursty,burst=pareto,seed=3" -> generate_workload kwargs
+    kwargs = {}
+    for item in filter(None, spec[len(GENERATED_PREFIX):].split(",")):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"bad generator option {item!r} in {spec!r}; expected key=value")
+        key = key.strip()
+        if key in ("n", "seed", "mean_burst", "priority_levels", "cpu_bursts"):
+            kwargs[key] = int(value)
+        elif key in ("load", "period", "mean_io"):
+            kwargs[key] = float(value)
+        elif key in ("arrival", "burst", "priority"):
+            kwargs[key] = value.strip()
+        else:
+            raise ValueError(f"unknown generator option {key!r} in {spec!r}")
+    if "n" not in kwargs:
+        raise ValueError(f"{spec!r} needs n=<processes>")
+    return kwargs
+
+
+def load_scenario(path):
+    if path.startswith(GENERATED_PREFIX):
+        stem = "gen-" + "-".join(item.replace("=", "") for item in path[len(GENERATED_PREFIX):].split(",") if item)
+        return generate_workload(**parse_generated(path)), stem
+    return load_workload(path), os.path.splitext(os.path.basename(path))[0]
+
+
+def simulate_file(path, algorithms, quanta, out_dir, fmt, write_gantt=True, cores=1, policy="global", options=None,
+                  switch_cost=0, migration_cost=0, stats=False, profile=None):
+    # stats/profile: run through engine.instrument, adding engine_* counters
+    # and timings to the summary rows and writing <label>_profile.txt.
+    # Deferred: the metrics need NumPy, which `main.py --help` should not load.
+    from analytics.metrics import summarize
+
+    table, stem = load_scenario(path)
+    target = os.path.join(out_dir, stem)
+    os.makedirs(target, exist_ok=True)
+    summary = []
+    for name, quantum in _runs(algorithms, quanta):
+        label = name if quantum is None else f"{name}_q{quantum}"
+        engine_stats = None
+        if stats or profile:
+            gantt_chart, results, engine_stats = run_instrumented(
+                name, table, quantum, cores=cores, policy=policy, options=(options or {}).get(name),
+                switch_cost=switch_cost, migration_cost=migration_cost, profile=profile)
+            if profile:
+                with open(os.path.join(target, f"{label}_profile.txt"), "w", encoding="utf-8") as fh:
+                    fh.write(engine_stats.pop("profile"))
+        else:
+            gantt_chart, results = run_algorithm(name, table, quantum, cores=cores, policy=policy,
+                                                 options=(options or {}).get(name), switch_cost=switch_cost,
+                                                 migration_cost=migration_cost)
+        _write_rows(results, os.path.join(target, f"{label}_metrics.{fmt}"), fmt)
+        if write_gantt:
+            _write_rows(gantt_chart, os.path.join(target, f"{label}_gantt.{fmt}"), fmt)
+        row = {"scenario": path, "algorithm": name, "quantum": quantum}
+        row.update(summarize(gantt_chart, results, cores))
+        if engine_stats is not None:
+            timings = engine_stats.pop("timings")
+            row.update({f"engine_{key}": value for key, value in engine_stats.items()})
+            row.update({f"engine_{key}_s": value for key, value in timings.items()})
+        summary.append(row)
+    return summary
+
+
+def _simulate_job(args):
+    return simulate_file(*args)
+
+
+def run_monte_carlo(args, algorithms, options):
+    # Perturbed replicas of each scenario; prints the intervals as they
+    # narrow and writes one row per scenario, algorithm and metric.
+    from analytics.montecarlo import monte_carlo
+
+    rows = []
+    for path in args.scenarios:
+        table, _ = load_scenario(path)
+        runs = monte_carlo(table, algorithms, args.replicas, args.seed, args.arrival_jitter, args.burst_noise,
+                           args.estimate_error, (args.quanta or [2])[0], args.cores, args.policy, options,
+                           args.switch_cost, args.migration_cost, args.confidence, max_workers=args.jobs)
+        shown = 0
+        for done, intervals in runs:
+            if done < args.replicas and time.monotonic() - shown < 1:
+                continue
+            shown = time.monotonic()
+            waits = "  ".join(f"{name} wait={ci['avg_waiting']['mean']:.2f}"
+                              f"±{ci['avg_waiting']['high'] - ci['avg_waiting']['mean']:.2f}"
+                              for name, ci in intervals.items())
+            print(f"{path}: {done}/{args.replicas}  {waits}", flush=True)
+        for name, per_metric in intervals.items():
+            for metric, ci in per_metric.items():
+                rows.append({"scenario": path, "algorithm": name, "metric": metric, **ci})
+    _write_rows(rows, os.path.join(args.output_dir, f"montecarlo.{args.format}"), args.format)
+
+
+def _cost(value):
+    # Whole numbers stay ints so integer workloads keep integer timelines.
+    number = float(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError("costs cannot be negative")
+    return int(number) if number.is_integer() else number
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run CPU scheduling simulations without the UI")
+    parser.add_argument("scenarios", nargs="+", help="scenario files (.json, .jsonl, .csv) or generated workloads, "
+                        "e.g. gen:n=10000,arrival=bursty,burst=pareto,priority=skewed,seed=1 "
+                        "(add cpu_bursts=3,mean_io=20 for processes that block on I/O)")
+    parser.add_argument("-a", "--algorithm", dest="algorithms", action="append", choices=sorted(ALGORITHMS),
+                        help="algorithm to run; repeat for several (default: all that support the core count)")
+    parser.add_argument("-q", "--quantum", dest="quanta", action="append", type=int,
+                        help="Round Robin quantum; repeat for several (default: 2)")
+    parser.add_argument("-o", "--output-dir", default="results")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="csv")
+    parser.add_argument("--no-gantt", action="store_true", help="skip writing Gantt segments")
+    parser.add_argument("-c", "--cores", type=int, default=1, help="number of CPU cores to simulate")
+    parser.add_argument("--policy", choices=POLICIES, default="global",
+                        help="multi-core ready queues: one global queue, or per-core queues with work stealing")
+    parser.add_argument("--switch-cost", type=_cost, default=0,
+                        help="time charged each time a CPU switches to another process")
+    parser.add_argument("--migration-cost", type=_cost, default=0,
+                        help="extra warm-up time when a process resumes on a different core")
+    parser.add_argument("--mlfq-quanta", type=int, nargs="+", metavar="Q",
+                        help="MLFQ time slice per level, top level first (default: 2 4 8)")
+    parser.add_argument("--mlfq-boost", type=int, help="move every MLFQ job back to the top level this often")
+    parser.add_argument("--cfs-latency", type=int, help="CFS target latency shared by runnable jobs (default: 12)")
+    parser.add_argument("--cfs-min-granularity", type=int, help="shortest CFS time slice (default: 1)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="scenario files to simulate in parallel (with --replicas: replica worker processes)")
+    parser.add_argument("--stats", action="store_true",
+                        help="count dispatches, preemptions, idle jumps, heap operations and peak ready queue, "
+                        "and time the engine phases (engine_* summary columns)")
+    parser.add_argument("--profile", choices=PROFILERS,
+                        help="profile each run and write <run>_profile.txt (pyinstrument must be installed)")
+    mc = parser.add_argument_group("Monte Carlo", "run perturbed replicas of each scenario and report confidence "
+                                   "intervals of the metrics (montecarlo.<format>) instead of single runs")
+    mc.add_argument("--replicas", type=int, help="number of perturbed replicas per scenario")
+    mc.add_argument("--seed", type=int, default=0, help="seed of the replica random streams")
+    mc.add_argument("--arrival-jitter", type=float, default=0, help="standard deviation of arrival-time noise")
+    mc.add_argument("--burst-noise", type=float, default=0, help="log-sd of the noise on actual CPU bursts")
+    mc.add_argument("--estimate-error", type=float, default=0,
+                    help="log-sd of the burst estimates SJF and SRTF schedule by, against the actual bursts")
+    mc.add_argument("--confidence", type=float, default=0.95, help="confidence level of the intervals")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    quanta = args.quanta or [2]
+    if any(q <= 0 for q in quanta):
+        parser.error("quanta must be positive")
+    if args.cores < 1:
+        parser.error("cores must be positive")
+    single_core = [name for name in args.algorithms or () if name not in MULTICORE_ALGORITHMS]
+    if args.cores > 1 and single_core:
+        parser.error(f"{', '.join(single_core)} cannot run on more than one core; drop them or use -c 1")
+    algorithms = args.algorithms or list(ALGORITHMS if args.cores == 1 else MULTICORE_ALGORITHMS)
+    if args.replicas is not None and (args.replicas < 1 or len(quanta) > 1 or not 0 < args.confidence < 1):
+        parser.error("--replicas needs a positive count, a single quantum and a confidence in (0, 1)")
+    os.makedirs(args.output_dir, exist_ok=True)
+    mlfq = {"quanta": args.mlfq_quanta, "boost": args.mlfq_boost}
+    cfs = {"latency": args.cfs_latency, "min_granularity": args.cfs_min_granularity}
+    options = {"mlfq": {k: v for k, v in mlfq.items() if v is not None},
+               "cfs": {k: v for k, v in cfs.items() if v is not None}}
+
+    if args.replicas is not None:
+        try:
+            run_monte_carlo(args, algorithms, options)
+        except (OSError, ValueError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+        return 0
+
+    jobs = [(path, algorithms, quanta, args.output_dir, args.format, not args.no_gantt, args.cores, args.policy,
+             options, args.switch_cost, args.migration_cost, args.stats, args.profile)
+            for path in args.scenarios]
+    summary = []
+    try:
+        if args.jobs > 1 and len(jobs) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                for rows in pool.map(_simulate_job, jobs):
+                    summary.extend(rows)
+        else:
+            for job in jobs:
+                summary.extend(_simulate_job(job))
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    _write_rows(summary, os.path.join(args.output_dir, f"summary.{args.format}"), args.format)
+    for row in summary:
+        q = "" if row["quantum"] is None else f" q={row['quantum']}"
+        if row["n_processes"]:
+            io = "" if row["io_overlap"] is None else f"  io_overlap={row['io_overlap']:.1%}"
+            print(f"{row['scenario']}: {row['algorithm']}{q}  n={row['n_processes']}  "
+                  f"wait={row['avg_waiting']:.2f}  tat={row['avg_turnaround']:.2f}  resp={row['avg_response']:.2f}  "
+                  f"util={row['cpu_utilisation']:.1%}{io}")
+            if "engine_dispatches" in row:
+                print(f"  engine: {row['engine_dispatches']} dispatches  {row['engine_preemptions']} preemptions  "
+                      f"{row['engine_idle_jumps']} idle jumps ({row['engine_idle_time']:g} idle time skipped)  "
+                      f"{row['engine_heap_pushes']}/{row['engine_heap_pops']} heap push/pop  "
+                      f"peak ready {row['engine_peak_ready']}  |  table {row['engine_table_s'] * 1000:.1f} ms  "
+                      f"schedule {row['engine_schedule_s'] * 1000:.1f} ms  output {row['engine_output_s'] * 1000:.1f} ms")
+        else:
+            print(f"{row['scenario']}: {row['algorithm']}{q}  n=0")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
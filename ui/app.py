@@ -1,21 +1,24 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import json
-import io
-import time
-import base64
+import os
 from datetime import datetime, timezone
+from itertools import islice
 
-from engine.algorithms import (
-    fcfs,
-    sjf_non_preemptive,
-    srtf,
-    round_robin,
-    priority_non_preemptive,
-    priority_preemptive
-)
+from plotly.colors import qualitative
+
+from engine.cache import SimulationCache
+from engine.compare import compare, round_robin_sweep
+from engine.loaders import load_workload
+from engine.multicore import MULTICORE_ALGORITHMS
+from engine.columns import OVERHEAD, labelled
+from engine.process_table import ProcessTable, as_process_table
+from engine.segments import SegmentStore
+from engine.timeline import Timeline
+from engine.workloads import ARRIVALS, BURSTS, PRIORITY_MIXES, generate_workload
+
+# pandas, NumPy, plotly.express (through ui.charts), analytics and the live
+# feed's asyncio are imported where they are first needed: the welcome page
+# and the controls render without them.
 
 st.set_page_config(layout="wide", page_title="Intelligent CPU Scheduler", initial_sidebar_state="collapsed")
 
@@ -34,8 +37,9 @@ if "compare_results" not in st.session_state:
 if "run_click" not in st.session_state:
     st.session_state.run_click = False
 
+@st.cache_resource
 def default_presets():
-    return {
+    return {name: ProcessTable.from_dicts(rows) for name, rows in {
         "Tiny (3)": [
             {"pid":"P1","arrival":0,"burst":1,"priority":1},
             {"pid":"P2","arrival":0,"burst":1,"priority":1},
@@ -55,7 +59,7 @@ def default_presets():
             {"pid":"P4","arrival":3,"burst":12,"priority":1},
             {"pid":"P5","arrival":4,"burst":1,"priority":1}
         ]
-    }
+    }.items()}
 
 PRIMARY_CSS = """
 <style>
@@ -83,8 +87,18 @@ html, body, .stApp { background: linear-gradient(180deg,#07090b 0%,#0b0f12 100%)
 st.markdown(PRIMARY_CSS, unsafe_allow_html=True)
 
 preset_map = default_presets()
+GENERATED_PRESET = "Generated workload"
+
+# Tables are read-only, so sessions share them instead of unpickling a copy per rerun.
+@st.cache_resource(max_entries=8)
+def generated_workload(n, arrival, burst, priority, seed, load, cpu_bursts=1, mean_io=None):
+    return generate_workload(n, arrival, burst, priority, seed=seed, load=load, cpu_bursts=cpu_bursts, mean_io=mean_io)
+PREVIEW_LIMIT = 50
+ALGORITHM_NAMES = ["FCFS","SJF (Non-Preemptive)","SRTF (Preemptive SJF)","Round Robin","Priority (Non-Preemptive)","Priority (Preemptive)","MLFQ","CFS (fair share)"]
+CORE_POLICIES = {"Global queue": "global", "Per-core queues (work stealing)": "per_core"}
+PROFILER_CHOICES = {"Off": None, "cProfile": "cprofile", "pyinstrument": "pyinstrument"}
 
-st.markdown("<div class='header'><div class='hero'>🧠 Intelligent CPU Scheduler</div><div class='lead'>Modern interactive simulator — FCFS · SJF · SRTF · Round Robin · Priority</div></div>", unsafe_allow_html=True)
+st.markdown("<div class='header'><div class='hero'>🧠 Intelligent CPU Scheduler</div><div class='lead'>Modern interactive simulator — FCFS · SJF · SRTF · Round Robin · Priority · MLFQ · CFS</div></div>", unsafe_allow_html=True)
 
 if not st.session_state.started:
     with st.container():
@@ -109,8 +123,22 @@ left, right = st.columns([1, 1.6])
 with left:
     st.markdown("<div class='container-card'>", unsafe_allow_html=True)
     st.markdown("<h3>Controls</h3>", unsafe_allow_html=True)
-    preset_choice = st.selectbox("Load preset scenario", options=["Custom"] + list(preset_map.keys()))
-    processes = preset_map[preset_choice] if preset_choice != "Custom" else None
+    preset_choice = st.selectbox("Load preset scenario", options=["Custom"] + list(preset_map.keys()) + [GENERATED_PRESET])
+    if preset_choice == GENERATED_PRESET:
+        gen_cols = st.columns(3)
+        gen_n = gen_cols[0].number_input("Processes", min_value=1, max_value=1_000_000, value=1000, step=100, key="gen_n")
+        gen_seed = gen_cols[1].number_input("Seed", min_value=0, value=0, key="gen_seed")
+        gen_load = gen_cols[2].number_input("Offered load", min_value=0.05, max_value=256.0, value=0.9, step=0.05, key="gen_load")
+        gen_cols = st.columns(3)
+        gen_arrival = gen_cols[0].selectbox("Arrivals", ARRIVALS, key="gen_arrival")
+        gen_burst = gen_cols[1].selectbox("Bursts", BURSTS, key="gen_burst")
+        gen_priority = gen_cols[2].selectbox("Priorities", PRIORITY_MIXES, key="gen_priority")
+        gen_cols = st.columns(2)
+        gen_cpu_bursts = gen_cols[0].number_input("CPU bursts per process", min_value=1, max_value=50, value=1, key="gen_cpu_bursts", help="More than one alternates CPU bursts with I/O waits")
+        gen_mean_io = gen_cols[1].number_input("Mean I/O wait", min_value=1, max_value=10_000, value=20, key="gen_mean_io", disabled=gen_cpu_bursts == 1)
+        processes = generated_workload(int(gen_n), gen_arrival, gen_burst, gen_priority, int(gen_seed), float(gen_load), int(gen_cpu_bursts), int(gen_mean_io))
+    else:
+        processes = preset_map[preset_choice] if preset_choice != "Custom" else None
 
     if processes is None:
         n = st.number_input("Number of processes", min_value=1, max_value=20, value=3, key="nproc")
@@ -120,7 +148,7 @@ with left:
         editable = False
 
     rows = []
-    palette = px.colors.qualitative.Plotly
+    palette = qualitative.Plotly
     if editable:
         st.markdown("<div>", unsafe_allow_html=True)
         for i in range(int(n)):
@@ -137,16 +165,26 @@ with left:
 
     process_list = rows
     st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
-    algo = st.selectbox("Scheduling algorithm", ["FCFS","SJF (Non-Preemptive)","SRTF (Preemptive SJF)","Round Robin","Priority (Non-Preemptive)","Priority (Preemptive)"], key="algo")
+    algo = st.selectbox("Scheduling algorithm", ALGORITHM_NAMES, key="algo")
     quantum = None
     if algo == "Round Robin":
         quantum = st.number_input("Time quantum", min_value=1, value=2, key="quantum")
+    core_cols = st.columns(2)
+    cores = int(core_cols[0].number_input("CPU cores", min_value=1, max_value=256, value=1, key="cores"))
+    policy = "global"
+    if cores > 1:
+        policy = CORE_POLICIES[core_cols[1].selectbox("Ready queues", list(CORE_POLICIES), key="core_policy")]
+    cost_cols = st.columns(2)
+    switch_cost = cost_cols[0].number_input("Context-switch cost", min_value=0, value=0, key="switch_cost")
+    migration_cost = 0
+    if cores > 1:
+        migration_cost = cost_cols[1].number_input("Migration warm-up", min_value=0, value=0, key="migration_cost")
     st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
 
     compare_toggle = st.checkbox("Enable algorithm comparison mode", value=False, key="compare_toggle")
     compare_algs = []
     if compare_toggle:
-        compare_algs = st.multiselect("Algorithms to compare", ["FCFS","SJF (Non-Preemptive)","SRTF (Preemptive SJF)","Round Robin","Priority (Non-Preemptive)","Priority (Preemptive)"], default=["FCFS","SJF (Non-Preemptive)"])
+        compare_algs = st.multiselect("Algorithms to compare", ALGORITHM_NAMES, default=["FCFS","SJF (Non-Preemptive)"])
         if "Round Robin" in compare_algs:
             q_comp = st.number_input("Quantum for Round Robin (comparison)", min_value=1, value=2, key="qcomp")
         else:
@@ -154,27 +192,62 @@ with left:
     else:
         q_comp = quantum
 
+    algo_options = {}
+    tuned = {algo, *compare_algs}
+    if "MLFQ" in tuned:
+        mcols = st.columns(3)
+        mlfq_levels = mcols[0].number_input("MLFQ levels", min_value=1, max_value=8, value=3, key="mlfq_levels")
+        mlfq_base = mcols[1].number_input("Top-level quantum", min_value=1, value=2, key="mlfq_base")
+        mlfq_boost = mcols[2].number_input("Boost every (0 = off)", min_value=0, value=0, key="mlfq_boost")
+        # Each level down doubles the quantum.
+        algo_options["mlfq"] = {"quanta": tuple(int(mlfq_base) * 2 ** k for k in range(int(mlfq_levels))), "boost": int(mlfq_boost) or None}
+    if "CFS (fair share)" in tuned:
+        fcols = st.columns(2)
+        cfs_latency = fcols[0].number_input("CFS target latency", min_value=1, value=12, key="cfs_latency")
+        cfs_granularity = fcols[1].number_input("Min granularity", min_value=1, value=1, key="cfs_granularity")
+        algo_options["cfs"] = {"latency": int(cfs_latency), "min_granularity": int(cfs_granularity)}
+
+    with st.expander("Round Robin quantum sweep"):
+        sweep_cols = st.columns(3)
+        sweep_min = sweep_cols[0].number_input("Min quantum", min_value=1, value=1, key="sweep_min")
+        sweep_max = sweep_cols[1].number_input("Max quantum", min_value=1, value=10, key="sweep_max")
+        sweep_step = sweep_cols[2].number_input("Step", min_value=1, value=1, key="sweep_step")
+        if st.button("Run sweep", key="run_sweep"):
+            quanta = range(int(sweep_min), int(max(sweep_min, sweep_max)) + 1, int(sweep_step))
+            st.session_state.rr_sweep = round_robin_sweep(process_list, quanta, switch_cost=switch_cost)
+
+    with st.expander("Live feed"):
+        st.caption("Schedule JSON Lines arriving on a named pipe, a file, unix:/path/to/socket or tcp:host:port, with the algorithm selected above (one core).")
+        feed_cols = st.columns([2, 1])
+        feed_source = feed_cols[0].text_input("Feed source", key="feed_source")
+        feed_seconds = feed_cols[1].number_input("Tail for (s)", min_value=1, max_value=3600, value=10, key="feed_seconds")
+        tail_click = st.button("📡 Tail feed", key="tail_feed", disabled=not feed_source)
+        feed_slot = st.empty()
+
+    with st.expander("Engine stats"):
+        st.caption("Count dispatches, preemptions, idle jumps, heap operations and the peak ready queue, and time the engine phases. Instrumented runs bypass the simulation cache; comparison runs are not instrumented.")
+        collect_stats = st.checkbox("Collect engine stats", value=False, key="collect_stats")
+        profiler = st.selectbox("Profiler", list(PROFILER_CHOICES), key="profiler", disabled=not collect_stats)
+
     run_col, save_col = st.columns([1,1])
     if run_col.button("▶ Run Simulation", key="run"):
         st.session_state.last_run = datetime.now(timezone.utc).isoformat()
         st.session_state.run_click = True
     if save_col.button("💾 Save scenario (.json)"):
-        buf = io.BytesIO(json.dumps(process_list, indent=2).encode("utf-8"))
-        st.download_button("Download scenario", data=buf, file_name="scenario.json", mime="application/json")
-    uploaded = st.file_uploader("Load scenario (.json)", type=["json"])
+        scenario = process_list.to_dicts() if isinstance(process_list, ProcessTable) else process_list
+        st.download_button("Download scenario", data=json.dumps(scenario, indent=2).encode("utf-8"), file_name="scenario.json", mime="application/json")
+    uploaded = st.file_uploader("Load scenario (.json, .jsonl, .csv)", type=["json", "jsonl", "ndjson", "csv"])
     if uploaded:
         try:
-            loaded = json.load(uploaded)
-            if isinstance(loaded, list):
-                process_list = loaded
-            else:
-                st.error("Invalid scenario file.")
+            process_list = load_workload(uploaded)
+        except ValueError as exc:
+            st.error(f"Invalid scenario file: {exc}")
         except Exception:
             st.error("Failed to load scenario.")
     st.markdown("<div style='height:10px'></div>", unsafe_allow_html=True)
     st.markdown("<div style='font-weight:700;margin-bottom:6px'>PID Color Preview</div>", unsafe_allow_html=True)
     preview_html = "<div style='display:flex;gap:10px;flex-wrap:wrap'>"
-    for i, p in enumerate(process_list):
+    for i, p in enumerate(islice(process_list, PREVIEW_LIMIT)):
         colr = palette[i % len(palette)]
         preview_html += f"<div style='display:flex;align-items:center;gap:8px;padding:6px 8px;border-radius:8px;background:rgba(255,255,255,0.015)'><div style='width:14px;height:14px;border-radius:4px;background:{colr};'></div><div style='font-weight:600'>{p['pid']}</div></div>"
     preview_html += "</div>"
@@ -187,102 +260,117 @@ with right:
     sim_space = st.empty()
     st.markdown("</div>", unsafe_allow_html=True)
 
-def run_selected_algorithm(algo_name, plist, quantum=None):
-    if algo_name == "FCFS":
-        return fcfs(plist)
-    if algo_name == "SJF (Non-Preemptive)":
-        return sjf_non_preemptive(plist)
-    if algo_name == "SRTF (Preemptive SJF)":
-        return srtf(plist)
-    if algo_name == "Round Robin":
-        return round_robin(plist, quantum)
-    if algo_name == "Priority (Non-Preemptive)":
-        return priority_non_preemptive(plist)
-    if algo_name == "Priority (Preemptive)":
-        return priority_preemptive(plist)
-    return [], []
-
-def prepare_gantt_df(gantt):
-    if not gantt:
+ALGORITHM_KEYS = {
+    "FCFS": "fcfs",
+    "SJF (Non-Preemptive)": "sjf_non_preemptive",
+    "SRTF (Preemptive SJF)": "srtf",
+    "Round Robin": "round_robin",
+    "Priority (Non-Preemptive)": "priority_non_preemptive",
+    "Priority (Preemptive)": "priority_preemptive",
+    "MLFQ": "mlfq",
+    "CFS (fair share)": "cfs",
+}
+
+@st.cache_resource
+def get_simulation_cache():
+    max_mb = int(os.environ.get("SCHEDULER_CACHE_MB", "256"))
+    disk_mb = int(os.environ.get("SCHEDULER_CACHE_DISK_MB", "1024"))
+    return SimulationCache(max_bytes=max_mb * 1024 * 1024, directory=os.environ.get("SCHEDULER_CACHE_DIR") or None,
+                           max_disk_bytes=disk_mb * 1024 * 1024)
+
+def run_selected_algorithm(algo_name, plist, quantum=None, output="rows", cores=1, policy="global", options=None,
+                           switch_cost=0, migration_cost=0):
+    if algo_name not in ALGORITHM_KEYS:
+        return [], []
+    key = ALGORITHM_KEYS[algo_name]
+    return get_simulation_cache().run(key, plist, quantum, output=output, cores=cores, policy=policy, options=(options or {}).get(key),
+                                      switch_cost=switch_cost, migration_cost=migration_cost)
+
+FEED_REDRAW_S = 0.5
+
+def draw_feed(scheduler, slot, frame):
+    import pandas as pd
+    from ui.charts import build_gantt_figure
+    snap = scheduler.snapshot()
+    with slot.container():
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Clock", f"{snap['time']:g}")
+        c2.metric("Completed", f"{snap['completed']}")
+        c3.metric("Avg Waiting", f"{snap['avg_waiting']:.2f}" if snap["avg_waiting"] is not None else "N/A")
+        c4.metric("CPU Utilisation", f"{snap['cpu_utilisation']:.1%}" if snap["cpu_utilisation"] is not None else "N/A")
+        st.caption(f"Running: {snap['running'] or 'idle'} · ready {snap['ready']} · blocked on I/O {snap['blocked']}")
+        if scheduler.segments:
+            df = pd.DataFrame(list(scheduler.segments))
+            df["duration"] = df["end"] - df["start"]
+            if "io" in df:
+                df["io"] = df["io"].fillna(False).astype(bool)
+            st.plotly_chart(build_gantt_figure(df, snap["time"], "Single-line"), width='stretch', key=f"feed_gantt_{frame}")
+
+def tail_feed(source, name, quantum, switch_cost, seconds, slot):
+    # Runs the asyncio driver for up to `seconds`, redrawing as events arrive.
+    import asyncio
+    import time
+    from engine.online import OnlineScheduler, open_feed, run_feed
+    scheduler = OnlineScheduler(name, quantum, switch_cost)
+
+    async def tail():
+        deadline = time.monotonic() + seconds
+        try:
+            events = run_feed(scheduler, await asyncio.wait_for(open_feed(source), timeout=seconds))
+        except asyncio.TimeoutError:
+            raise ValueError(f"nothing connected to {source} within {seconds} s") from None
+        drawn = frame = 0
+        while True:
+            try:
+                await asyncio.wait_for(events.__anext__(), timeout=max(deadline - time.monotonic(), 0))
+            except (StopAsyncIteration, asyncio.TimeoutError):
+                break
+            if time.monotonic() - drawn >= FEED_REDRAW_S:
+                frame += 1
+                draw_feed(scheduler, slot, frame)
+                drawn = time.monotonic()
+        await events.aclose()
+        draw_feed(scheduler, slot, frame + 1)
+
+    asyncio.run(tail())
+
+def prepare_gantt_df(store, pids, view_mode=None):
+    import numpy as np
+    import pandas as pd
+    from ui.charts import GANTT_MAX_SEGMENTS, GANTT_TARGET_PX
+    if not len(store):
         return pd.DataFrame()
-    df = pd.DataFrame(gantt)
-    df["start"] = df["start"].astype(float)
-    df["end"] = df["end"].astype(float)
-    df["duration"] = df["end"] - df["start"]
+    gantt = store.to_columns()
+    if view_mode != "Stacked per PID" and len(store) > GANTT_MAX_SEGMENTS:
+        # Zoomed all the way out: chart the store's level-of-detail summary
+        # rather than handing every segment to pandas.
+        gantt = store.summary(gantt["start"][0], gantt["end"].max(), GANTT_TARGET_PX).to_columns()
+    start = gantt["start"].astype(float)
+    end = gantt["end"].astype(float)
+    labels = np.asarray(list(pids) + [None], dtype=object)  # switch overhead -> None
+    df = pd.DataFrame({"pid": labels[gantt["pid_idx"]], "start": start, "end": end, "duration": end - start})
+    if "core" in gantt:
+        df["core"] = gantt["core"]
+    if "io" in gantt:
+        df["io"] = gantt["io"]
     return df
 
-def compact_color_map(pids):
-    palette = px.colors.qualitative.Plotly
-    cmap = {pid: palette[i % len(palette)] for i, pid in enumerate(pids)}
-    return cmap
-
-def build_gantt_figure(gantt_df, sim_time, view_mode="Single-line"):
-    if gantt_df.empty:
-        fig = go.Figure()
-        fig.update_layout(height=260, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-        return fig
-    cmap = compact_color_map(gantt_df["pid"].unique().tolist())
-    if view_mode == "Single-line":
-        df = gantt_df.copy().sort_values(by=["start"]).reset_index(drop=True)
-        df["label"] = df.apply(lambda r: f"{r['pid']} ({int(r['start'])}→{int(r['end'])})", axis=1)
-        fig = go.Figure()
-        for idx, row in df.iterrows():
-            duration = row["duration"]
-            is_running = (sim_time is not None and row["start"] <= sim_time < row["end"])
-            linew = 3 if is_running else 0
-            linec = "white" if is_running else "rgba(0,0,0,0)"
-            fig.add_trace(go.Bar(
-                x=[duration],
-                y=["CPU"],
-                base=[row["start"]],
-                orientation="h",
-                marker=dict(color=cmap[row["pid"]], line=dict(color=linec, width=linew)),
-                hovertemplate=f"<b>{row['pid']}</b><br>Start: {row['start']}<br>End: {row['end']}<extra></extra>",
-                text=[row["label"]],
-                textposition="inside",
-                insidetextanchor="middle",
-                cliponaxis=False,
-                showlegend=False
-            ))
-        fig.update_xaxes(title_text="Time", tick0=0, dtick=1, zeroline=True)
-        fig.update_yaxes(visible=False)
-        fig.update_layout(barmode="stack", height=240, margin=dict(l=40, r=20, t=10, b=40), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-        if sim_time is not None:
-            fig.add_vline(x=sim_time, line=dict(color="white", width=2, dash="dash"), opacity=0.8)
-        return fig
-
-    unique = gantt_df["pid"].unique().tolist()
-    fig = go.Figure()
-    for _, row in gantt_df.iterrows():
-        is_running = (sim_time is not None and row["start"] <= sim_time < row["end"])
-        linew = 3 if is_running else 0
-        linec = "white" if is_running else "rgba(0,0,0,0)"
-        fig.add_trace(go.Bar(
-            x=[row["duration"]],
-            y=[row["pid"]],
-            base=[row["start"]],
-            orientation="h",
-            marker=dict(color=cmap[row["pid"]], line=dict(color=linec, width=linew)),
-            hovertemplate=f"<b>{row['pid']}</b><br>Start: {row['start']}<br>End: {row['end']}<extra></extra>",
-            text=[row["pid"]],
-            textposition="inside",
-            insidetextanchor="middle",
-            cliponaxis=False,
-            showlegend=False
-        ))
-    for pid in unique:
-        fig.add_trace(go.Bar(x=[0], y=[pid], marker=dict(color=cmap[pid]), name=pid, showlegend=True))
-    fig.update_layout(barmode="stack", height=420, xaxis=dict(title="Time", tick0=0, dtick=1), yaxis=dict(autorange="reversed"), margin=dict(l=80, r=20, t=10, b=40), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-    fig.add_vline(x=sim_time, line=dict(color="white", width=2, dash="dash"), opacity=0.7)
-    return fig
-
-def metrics_from_results(results):
-    if not results:
+def running_label(running, pids, cores):
+    # "P3", or "CPU 0: P3 · CPU 1: idle"-style text for a Timeline.running list.
+    names = {c: pids[j] if j != OVERHEAD else "switching" for c, j in running}
+    if cores == 1:
+        return names.get(0, "idle")
+    return " · ".join(f"CPU {c}: {names.get(c, 'idle')}" for c in range(cores))
+
+def metrics_from_results(results, pids):
+    import pandas as pd
+    if not results or len(results["pid_idx"]) == 0:
         return pd.DataFrame()
-    df = pd.DataFrame(results)
-    return df
+    return pd.DataFrame(labelled(results, pids))
 
 def generate_html_report(df_metrics, fig, summary):
+    import base64
+    import pandas as pd
     html = "<html><head><meta charset='utf-8'><title>Simulation Report</title></head><body style='background:#0b0f12;color:#eaf1ff;font-family:Inter, sans-serif;padding:20px;'>"
     html += "<h1>Simulation Report</h1>"
     html += "<h2>Metrics</h2>"
@@ -313,30 +401,82 @@ document.addEventListener('keydown', function(e) {
 </script>
 """, unsafe_allow_html=True)
 
+if tail_click:
+    from engine.online import ONLINE_ALGORITHMS
+    feed_key = ALGORITHM_KEYS[algo]
+    if feed_key not in ONLINE_ALGORITHMS or cores > 1:
+        feed_slot.error(f"Live feeds run on one core with {', '.join(k for k, v in ALGORITHM_KEYS.items() if v in ONLINE_ALGORITHMS)}.")
+    else:
+        try:
+            tail_feed(feed_source, feed_key, quantum, switch_cost, int(feed_seconds), feed_slot)
+        except (OSError, ValueError) as exc:
+            feed_slot.error(f"Feed failed: {exc}")
+
+single_core_only = sorted(a for a in ({algo} if not (compare_toggle and compare_algs) else set(compare_algs))
+                          if ALGORITHM_KEYS[a] not in MULTICORE_ALGORITHMS)
+if st.session_state.run_click and cores > 1 and single_core_only:
+    st.session_state.run_click = False
+    st.error(f"{', '.join(single_core_only)} can only be simulated on one core; set CPU cores to 1.")
+
 if st.session_state.run_click:
     st.session_state.run_click = False
+    table = as_process_table(process_list)
+    st.session_state.pids = table.pids
+    st.session_state.engine_stats = None
     if compare_toggle and compare_algs:
+        rr_quantum = q_comp if q_comp is not None else quantum
+        runs = compare(table, [ALGORITHM_KEYS[a] for a in compare_algs], quantum=rr_quantum, output="columns", cache=get_simulation_cache(), cores=cores, policy=policy, options=algo_options, switch_cost=switch_cost, migration_cost=migration_cost)
         results_compare = {}
         for a in compare_algs:
-            q = q_comp if (a == "Round Robin" and q_comp is not None) else (quantum if a == "Round Robin" else None)
-            g, m = run_selected_algorithm(a, process_list, q)
-            results_compare[a] = {"gantt": g, "metrics": m}
+            g, m = runs[ALGORITHM_KEYS[a]]
+            # Kept in the session as compact segment arrays.
+            results_compare[a] = {"gantt": SegmentStore.from_columns(g), "metrics": m}
         st.session_state.compare_results = results_compare
         first_alg = compare_algs[0]
         st.session_state.gantt = results_compare[first_alg]["gantt"]
         st.session_state.metrics = results_compare[first_alg]["metrics"]
+    elif collect_stats:
+        from engine.instrument import run_instrumented
+        from importlib.util import find_spec
+        key = ALGORITHM_KEYS[algo]
+        profile = PROFILER_CHOICES[profiler]
+        if profile == "pyinstrument" and find_spec("pyinstrument") is None:
+            st.info("The pyinstrument profiler is not installed. Run: python -m pip install pyinstrument")
+            profile = None
+        results_gantt, results_metrics, st.session_state.engine_stats = run_instrumented(key, table, quantum, "columns", cores, policy, algo_options.get(key), switch_cost, migration_cost, profile=profile)
+        st.session_state.gantt = SegmentStore.from_columns(results_gantt)
+        st.session_state.metrics = results_metrics
     else:
-        results_gantt, results_metrics = run_selected_algorithm(algo, process_list, quantum)
-        st.session_state.gantt = results_gantt
+        results_gantt, results_metrics = run_selected_algorithm(algo, table, quantum, output="columns", cores=cores, policy=policy, options=algo_options, switch_cost=switch_cost, migration_cost=migration_cost)
+        st.session_state.gantt = SegmentStore.from_columns(results_gantt)
         st.session_state.metrics = results_metrics
+    # The summaries and per-core views count idle cores too.
+    st.session_state.run_cores = cores
+    if cores > 1:
+        st.session_state.view_radio = "Per core"
     st.session_state.sim_time = 0.0
+    st.session_state.playing = False
+    st.session_state.run_id = st.session_state.get("run_id", 0) + 1
 
 if "gantt" in st.session_state:
-    gantt_df = prepare_gantt_df(st.session_state.gantt)
-    metrics_df = metrics_from_results(st.session_state.metrics)
+    import pandas as pd
+    import plotly.express as px
+    from analytics.metrics import compare_summary, core_utilisation, summarize
+    from ui.charts import build_gantt_figure, build_playback_figure, compact_color_map
+    gantt = st.session_state.gantt.to_columns()
+    metrics_df = metrics_from_results(st.session_state.metrics, st.session_state.pids)
+    has_gantt, has_metrics = len(gantt["start"]) > 0, not metrics_df.empty
+    # Point-in-time index for the cursor, the Step button and the inspector.
+    cached = st.session_state.get("timeline")
+    if cached is None or cached[0] != st.session_state.get("run_id"):
+        cached = (st.session_state.get("run_id"), Timeline(st.session_state.gantt, st.session_state.metrics))
+        st.session_state.timeline = cached
+    timeline = cached[1]
+    n_cores = st.session_state.get("run_cores", 1)
 else:
-    gantt_df = pd.DataFrame()
-    metrics_df = pd.DataFrame()
+    gantt = metrics_df = timeline = None
+    n_cores = 1
+    has_gantt = has_metrics = False
 
 with sim_space.container():
     cols = st.columns([1, 0.02, 1])
@@ -352,7 +492,8 @@ with sim_space.container():
         if pcrow[1].button("⏸ Pause", key="pause_top"):
             st.session_state.playing = False
         if pcrow[2].button("⏭ Step", key="step_top"):
-            st.session_state.sim_time = min((gantt_df["end"].max() if not gantt_df.empty else 0), st.session_state.sim_time + 0.5)
+            st.session_state.playing = False
+            st.session_state.sim_time = min((timeline.end if has_gantt else 0), st.session_state.sim_time + 0.5)
         with pcrow[3]:
             if st.button("⏮ Reset", key="reset_top"):
                 st.session_state.sim_time = 0.0
@@ -361,40 +502,73 @@ with sim_space.container():
 
         st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
         st.markdown("**Performance Metrics**")
-        if metrics_df.empty:
+        if not has_metrics:
             st.write("No metrics yet. Run the simulation.")
         else:
             st.dataframe(metrics_df, height=200)
-            avg_waiting = metrics_df['waiting'].mean()
-            avg_turnaround = metrics_df['turnaround'].mean()
-            avg_response = metrics_df['response'].mean()
-            total_time = gantt_df['end'].max() if not gantt_df.empty else 0.0
-            throughput = (len(metrics_df) / total_time) if total_time > 0 else None
+            stats = summarize(gantt, st.session_state.metrics, n_cores)
+            throughput = stats["throughput"]
             s1, s2, s3, s4 = st.columns(4)
-            s1.metric("Avg Waiting Time", f"{avg_waiting:.2f}")
-            s2.metric("Avg Turnaround Time", f"{avg_turnaround:.2f}")
-            s3.metric("Avg Response Time", f"{avg_response:.2f}")
+            s1.metric("Avg Waiting Time", f"{stats['avg_waiting']:.2f}")
+            s2.metric("Avg Turnaround Time", f"{stats['avg_turnaround']:.2f}")
+            s3.metric("Avg Response Time", f"{stats['avg_response']:.2f}")
             s4.metric("Throughput (proc / time)", f"{throughput:.3f}" if throughput is not None else "N/A")
-            summary = {
-                "avg_waiting": round(avg_waiting, 4),
-                "avg_turnaround": round(avg_turnaround, 4),
-                "avg_response": round(avg_response, 4),
-                "throughput": round(throughput, 4) if throughput is not None else None,
-                "total_time": float(total_time),
-                "n_processes": int(len(metrics_df))
-            }
+            s5, s6, s7, s8 = st.columns(4)
+            s5.metric("p95 Waiting Time", f"{stats['p95_waiting']:.2f}")
+            s6.metric("CPU Utilisation", f"{stats['cpu_utilisation']:.1%}" if stats["cpu_utilisation"] is not None else "N/A")
+            s7.metric("Context Switches", f"{stats['context_switches']}")
+            s8.metric("Fairness (Jain)", f"{stats['fairness']:.3f}" if stats["fairness"] is not None else "N/A")
+            if stats["overhead_time"]:
+                capacity = stats["total_time"] * stats["cores"]
+                st.caption(f"Switch overhead: {stats['overhead_time']:g} time units ({stats['overhead_time'] / capacity:.1%} of CPU time)")
+            if stats["io_overlap"] is not None:
+                st.caption(f"I/O waits: {stats['io_time']:g} time units · CPU busy during {stats['io_overlap']:.1%} of the time I/O was in flight")
+            summary = {k: round(v, 4) if isinstance(v, float) else v for k, v in stats.items()}
+            if stats["cores"] > 1:
+                util = core_utilisation(gantt, stats["cores"])
+                with st.expander("Per-core utilisation"):
+                    st.bar_chart(pd.DataFrame({"utilisation": util}, index=[f"CPU {c}" for c in range(len(util))]))
+
+        engine_stats = st.session_state.get("engine_stats")
+        if engine_stats:
+            with st.expander("Engine stats", expanded=True):
+                e1, e2, e3, e4 = st.columns(4)
+                e1.metric("Dispatches", engine_stats["dispatches"])
+                e2.metric("Preemptions", engine_stats["preemptions"])
+                e3.metric("Heap push / pop", f"{engine_stats['heap_pushes']} / {engine_stats['heap_pops']}")
+                e4.metric("Peak ready queue", engine_stats["peak_ready"])
+                st.caption(f"Idle gaps jumped: {engine_stats['idle_jumps']} ({engine_stats['idle_time']:g} time units a tick loop would have stepped through)")
+                timings = engine_stats["timings"]
+                st.caption(" · ".join(f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in timings.items()))
+                if "profile" in engine_stats:
+                    st.code(engine_stats["profile"], language=None)
+                    st.download_button("⬇ Download profile", data=engine_stats["profile"].encode("utf-8"), file_name="engine_profile.txt", mime="text/plain")
 
         st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
         st.markdown("**Gantt Chart**")
-        view_mode = st.radio("View mode", ["Single-line", "Stacked per PID"], index=0, key="view_radio")
+        view_modes = ["Single-line", "Stacked per PID"] + (["Per core"] if has_gantt and "core" in gantt else [])
+        view_mode = st.radio("View mode", view_modes, index=0, key="view_radio")
         st.session_state.view_mode = view_mode
-        if gantt_df.empty:
+        gantt_df = prepare_gantt_df(st.session_state.gantt, st.session_state.pids, view_mode) if has_gantt else None
+        if not has_gantt:
             st.write("No Gantt to display.")
         else:
-            tnow = st.session_state.sim_time if "sim_time" in st.session_state else 0.0
-            fig = build_gantt_figure(gantt_df, tnow, view_mode)
+            if st.session_state.playing:
+                # Built once per run/view; the browser animates the cursor.
+                fig_key = (st.session_state.get("run_id"), view_mode, st.session_state.speed)
+                cached = st.session_state.get("playback_fig")
+                if cached is None or cached[0] != fig_key:
+                    cached = (fig_key, build_playback_figure(gantt_df, view_mode, st.session_state.speed, cores=n_cores))
+                    st.session_state.playback_fig = cached
+                fig = cached[1]
+                st.caption("Playback runs in the browser: use ▶ Play and the slider under the chart.")
+            else:
+                tnow = st.session_state.sim_time if "sim_time" in st.session_state else 0.0
+                fig = build_gantt_figure(gantt_df, tnow, view_mode, n_cores)
+                now = running_label(timeline.running(tnow), st.session_state.pids, n_cores)
+                st.markdown(f"<div class='now-running'>t = {tnow:g} · {now}</div>", unsafe_allow_html=True)
             st.plotly_chart(fig, width='stretch')
-            unique = gantt_df["pid"].unique().tolist()
+            unique = gantt_df["pid"].dropna().unique().tolist()
             cmap = compact_color_map(unique)
             legend_html = "<div class='legend-grid'>"
             for pid, colr in cmap.items():
@@ -402,46 +576,64 @@ with sim_space.container():
             legend_html += "</div>"
             st.markdown(legend_html, unsafe_allow_html=True)
 
+            with st.expander("State at time t"):
+                pids = st.session_state.pids
+                t_inspect = st.number_input("t", min_value=0.0, max_value=float(timeline.end),
+                                            value=min(float(st.session_state.sim_time), float(timeline.end)), key="inspect_t")
+                state = timeline.state(t_inspect, limit=20)
+                st.markdown(f"**Running:** {running_label(state['running'], pids, n_cores)}")
+                i1, i2, i3, i4 = st.columns(4)
+                i1.metric("Ready", state["ready"])
+                i2.metric("Blocked on I/O", state["blocked"])
+                i3.metric("Completed", f"{state['completed']} / {len(pids)}")
+                i4.metric("Remaining work", f"{state['remaining']:g}")
+                if state["ready_pids"]:
+                    more = " …" if state["ready"] > len(state["ready_pids"]) else ""
+                    st.caption("Ready queue: " + ", ".join(pids[j] for j in state["ready_pids"]) + more)
+                pick = st.selectbox("Remaining work of", ["—"] + list(islice(pids, 1000)), key="inspect_pid")
+                if pick != "—":
+                    j = pids.index(pick)
+                    st.caption(f"{pick}: {timeline.remaining(t_inspect, j):g} time units of CPU work left")
+
     with left_panel:
         st.markdown("**Controls & Downloads**")
-        if st.session_state.playing and not gantt_df.empty:
-            max_t = max(gantt_df["end"].max(), 1)
-            st.session_state.sim_time = min(max_t, st.session_state.sim_time + 0.25 * st.session_state.speed)
-            time.sleep(0.12)
-            try:
-                st.rerun()
-            except Exception:
-                try:
-                    st.experimental_rerun()
-                except Exception:
-                    st.info("Please refresh the page to continue.")
+        cache_stats = get_simulation_cache().stats()
+        st.caption(f"Simulation cache: {cache_stats['hits'] + cache_stats['disk_hits']} hits · {cache_stats['misses']} misses · {cache_stats['entries']} entries")
         # Downloads & comparisons
         if st.session_state.compare_results:
-            compare_summary = []
-            for a, res in st.session_state.compare_results.items():
-                m = pd.DataFrame(res["metrics"])
-                if not m.empty:
-                    compare_summary.append({"algorithm": a, "avg_wait": m["waiting"].mean(), "avg_turn": m["turnaround"].mean(), "avg_resp": m["response"].mean()})
-            if compare_summary:
-                cdf = pd.DataFrame(compare_summary)
+            comparison = compare_summary({a: (res["gantt"].to_columns(), res["metrics"]) for a, res in st.session_state.compare_results.items()}, n_cores)
+            if comparison["algorithm"]:
+                cdf = pd.DataFrame(comparison)
                 st.markdown("### Comparison summary")
-                st.table(cdf)
-                figc = px.bar(cdf.melt(id_vars=["algorithm"], value_vars=["avg_wait","avg_turn","avg_resp"], var_name="metric", value_name="value"), x="algorithm", y="value", color="metric", barmode="group", title="Average metrics per algorithm")
+                columns = ["algorithm", "avg_waiting", "avg_turnaround", "avg_response", "p95_waiting", "cpu_utilisation", "context_switches", "overhead_time", "fairness"]
+                if cdf["io_overlap"].notna().any():
+                    columns.insert(6, "io_overlap")
+                st.table(cdf[columns])
+                figc = px.bar(cdf.melt(id_vars=["algorithm"], value_vars=["avg_waiting","avg_turnaround","avg_response"], var_name="metric", value_name="value"), x="algorithm", y="value", color="metric", barmode="group", title="Average metrics per algorithm")
                 st.plotly_chart(figc, width='stretch')
 
-        if not metrics_df.empty:
+        if st.session_state.get("rr_sweep") and st.session_state.rr_sweep["quantum"]:
+            import pandas as pd
+            import plotly.express as px
+            sweep_df = pd.DataFrame(st.session_state.rr_sweep)
+            st.markdown("### Round Robin quantum sweep")
+            figs = px.line(sweep_df.melt(id_vars=["quantum"], value_vars=["avg_waiting","avg_turnaround","avg_response"], var_name="metric", value_name="value"), x="quantum", y="value", color="metric", markers=True, title="Average metrics per quantum")
+            st.plotly_chart(figs, width='stretch')
+            st.dataframe(sweep_df, height=200)
+
+        if has_metrics:
             csv = metrics_df.to_csv(index=False).encode("utf-8")
             st.download_button("⬇ Download CSV", data=csv, file_name="metrics.csv", mime="text/csv")
             summary_df = pd.DataFrame([summary]) if 'summary' in locals() else pd.DataFrame()
             combined_csv = pd.concat([metrics_df, pd.DataFrame([{}]), summary_df], ignore_index=True).to_csv(index=False)
             st.download_button("⬇ Download CSV (with summary)", data=combined_csv.encode("utf-8"), file_name="metrics_with_summary.csv", mime="text/csv")
         try:
-            if not gantt_df.empty:
+            if has_gantt:
                 img_bytes = fig.to_image(format="png", width=1200, height=480, scale=2)
                 st.download_button("⬇ Download Gantt PNG", data=img_bytes, file_name="gantt.png", mime="image/png")
         except Exception:
             st.info("PNG export requires 'kaleido'. Run: python -m pip install kaleido")
-        if not metrics_df.empty and not gantt_df.empty:
+        if has_metrics and has_gantt:
             html_report = generate_html_report(metrics_df, fig, summary if 'summary' in locals() else {})
             st.download_button("⬇ Download full HTML report", data=html_report, file_name="report.html", mime="text/html")
 
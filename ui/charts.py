@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Above this many segments, bars narrower than one pixel are merged.
+GANTT_MAX_SEGMENTS = 2000
+GANTT_TARGET_PX = 1200
+# Per-bar text labels are only drawn for small charts.
+GANTT_MAX_LABELS = 200
+# Client-side playback: frames advance PLAYBACK_STEP time units every
+# PLAYBACK_FRAME_MS at speed 1, capped at PLAYBACK_MAX_FRAMES frames.
+PLAYBACK_STEP = 0.25
+PLAYBACK_FRAME_MS = 120
+PLAYBACK_MAX_FRAMES = 240
+# Context-switch overhead segments (pid None) are drawn as their own grey bars.
+SWITCH_LABEL = "⟳ switch"
+SWITCH_COLOR = "#5c6370"
+# I/O waits are only drawn in the stacked view, as faint bars on the PID's row.
+IO_OPACITY = 0.3
+
+
+def compact_color_map(pids):
+    palette = px.colors.qualitative.Plotly
+    cmap = {pid: palette[i % len(palette)] for i, pid in enumerate(pids)}
+    return cmap
+
+
+def _discrete_colorscale(palette):
+    # Step colourscale so bar colours can be sent as small integers instead
+    # of one colour string per bar.
+    n = len(palette)
+    return [[k / n, c] for i, c in enumerate(palette) for k in (i, i + 1)]
+
+
+def _merge_stacked(df, resolution):
+    # Close gaps narrower than `resolution` between bars of the same PID.
+    df = df.sort_values(by=["pid", "start"], kind="stable")
+    prev_end = df.groupby("pid", sort=False)["end"].shift()
+    run = (prev_end.isna() | (df["start"] - prev_end >= resolution)).cumsum()
+    out = df.groupby(run, sort=False).agg(pid=("pid", "first"), start=("start", "min"), end=("end", "max"))
+    return out.reset_index(drop=True)
+
+
+def _merge_single_line(df, resolution):
+    # Bars at least one pixel wide are kept; narrower ones are bucketed per
+    # pixel and drawn as one bar coloured by the PID that ran longest in it.
+    # Multi-core charts are bucketed per core lane.
+    lanes = ["core"] if "core" in df else []
+    wide = df[df["duration"] >= resolution]
+    narrow = df[df["duration"] < resolution]
+    if narrow.empty:
+        return df[lanes + ["pid", "start", "end"]]
+    narrow = narrow.assign(bucket=(narrow["start"] // resolution).astype(np.int64))
+    keys = lanes + ["bucket"]
+    span = narrow.groupby(keys).agg(start=("start", "min"), end=("end", "max"))
+    share = narrow.groupby(keys + ["pid"], sort=False)["duration"].sum().reset_index()
+    dominant = share.loc[share.groupby(keys)["duration"].idxmax(), keys + ["pid"]].set_index(keys)
+    merged = span.join(dominant).reset_index().drop(columns="bucket")
+    return pd.concat([wide[lanes + ["pid", "start", "end"]], merged], ignore_index=True)
+
+
+def downsample_gantt(gantt_df, view_mode="Single-line", max_segments=GANTT_MAX_SEGMENTS, target_px=GANTT_TARGET_PX):
+    if len(gantt_df) <= max_segments:
+        return gantt_df
+    resolution = (gantt_df["end"].max() - gantt_df["start"].min()) / target_px
+    if resolution <= 0:
+        return gantt_df
+    if view_mode in ("Single-line", "Per core"):
+        df = _merge_single_line(gantt_df, resolution)
+    else:
+        df = _merge_stacked(gantt_df, resolution)
+    df = df.sort_values(by=["start"], kind="stable").reset_index(drop=True)
+    df["duration"] = df["end"] - df["start"]
+    return df
+
+
+def build_gantt_figure(gantt_df, sim_time, view_mode="Single-line", cores=None):
+    if gantt_df.empty:
+        fig = go.Figure()
+        fig.update_layout(height=260, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+        return fig
+    io_df = None
+    if "io" in gantt_df:
+        io = gantt_df["io"].to_numpy(dtype=bool)
+        io_df = gantt_df[io].drop(columns=["io", "core"], errors="ignore")
+        gantt_df = gantt_df[~io].drop(columns="io")
+    unique = gantt_df["pid"].dropna().unique().tolist()
+    cmap = compact_color_map(unique)
+    has_switches = bool(gantt_df["pid"].isna().any())
+    if has_switches:
+        gantt_df = gantt_df.assign(pid=gantt_df["pid"].fillna(SWITCH_LABEL))
+    per_core = view_mode == "Per core" and "core" in gantt_df
+    single = view_mode == "Single-line" or per_core
+    df = downsample_gantt(gantt_df if per_core or "core" not in gantt_df else gantt_df.drop(columns="core"), view_mode)
+    if per_core:
+        # Idle cores have no segments but still get a lane.
+        lanes = [f"CPU {c}" for c in range(cores or int(gantt_df["core"].max()) + 1)]
+        lane = np.asarray(lanes, dtype=object)[df["core"].to_numpy(dtype=np.int64)]
+    else:
+        lane = np.full(len(df), "CPU", dtype=object)
+
+    # All bars go into one trace with per-bar colours, so the figure size
+    # grows with the number of bars rather than with one trace per bar.
+    pid = df["pid"].to_numpy(dtype=object)
+    palette = px.colors.qualitative.Plotly + [SWITCH_COLOR]
+    codes = pd.Categorical(df["pid"], categories=unique).codes
+    color = np.where(codes < 0, len(palette) - 1, codes % (len(palette) - 1)) + 0.5
+    start = df["start"].to_numpy()
+    end = df["end"].to_numpy()
+    if sim_time is not None:
+        running = (start <= sim_time) & (sim_time < end)
+    else:
+        running = np.zeros(len(df), dtype=bool)
+    if len(df) > GANTT_MAX_LABELS:
+        text = None
+    elif single:
+        text = [f"{p} ({int(s)}→{int(e)})" for p, s, e in zip(pid, start, end)]
+    else:
+        text = pid
+    fig = go.Figure(go.Bar(
+        x=end - start,
+        y=lane if single else pid,
+        base=start,
+        orientation="h",
+        marker=dict(color=color, colorscale=_discrete_colorscale(palette), cmin=0, cmax=len(palette), line=dict(color="white", width=np.where(running, 3, 0))),
+        customdata=np.column_stack([pid, start, end]),
+        hovertemplate="<b>%{customdata[0]}</b><br>Start: %{customdata[1]}<br>End: %{customdata[2]}<extra></extra>",
+        text=text,
+        textposition="inside" if text is not None else "none",
+        insidetextanchor="middle",
+        cliponaxis=False,
+        showlegend=False
+    ))
+
+    dtick = 1 if gantt_df["end"].max() <= 60 else None
+    if per_core:
+        fig.update_xaxes(title_text="Time", tick0=0, dtick=dtick, zeroline=True)
+        fig.update_yaxes(autorange="reversed", categoryorder="array", categoryarray=lanes)
+        fig.update_layout(barmode="overlay", height=max(240, min(900, 60 + 24 * len(lanes))), margin=dict(l=60, r=20, t=10, b=40), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+        if sim_time is not None:
+            fig.add_vline(x=sim_time, line=dict(color="white", width=2, dash="dash"), opacity=0.8)
+        return fig
+    if single:
+        fig.update_xaxes(title_text="Time", tick0=0, dtick=dtick, zeroline=True)
+        fig.update_yaxes(visible=False)
+        fig.update_layout(barmode="overlay", height=240, margin=dict(l=40, r=20, t=10, b=40), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+        if sim_time is not None:
+            fig.add_vline(x=sim_time, line=dict(color="white", width=2, dash="dash"), opacity=0.8)
+        return fig
+
+    if io_df is not None and not io_df.empty:
+        io_df = downsample_gantt(io_df, view_mode)
+        io_start = io_df["start"].to_numpy()
+        io_end = io_df["end"].to_numpy()
+        io_codes = pd.Categorical(io_df["pid"], categories=unique).codes % (len(palette) - 1) + 0.5
+        fig.add_trace(go.Bar(
+            x=io_end - io_start,
+            y=io_df["pid"].to_numpy(dtype=object),
+            base=io_start,
+            orientation="h",
+            opacity=IO_OPACITY,
+            marker=dict(color=io_codes, colorscale=_discrete_colorscale(palette), cmin=0, cmax=len(palette)),
+            customdata=np.column_stack([io_df["pid"].to_numpy(dtype=object), io_start, io_end]),
+            hovertemplate="<b>%{customdata[0]}</b> waiting on I/O<br>Start: %{customdata[1]}<br>End: %{customdata[2]}<extra></extra>",
+            showlegend=False
+        ))
+    if len(unique) <= GANTT_MAX_LABELS:
+        for p in unique:
+            fig.add_trace(go.Bar(x=[0], y=[p], marker=dict(color=cmap[p]), name=p, showlegend=True))
+    fig.update_layout(barmode="overlay", height=420, xaxis=dict(title="Time", tick0=0, dtick=dtick), yaxis=dict(autorange="reversed", categoryorder="array", categoryarray=unique + [SWITCH_LABEL] * has_switches), margin=dict(l=80, r=20, t=10, b=40), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+    if sim_time is not None:
+        fig.add_vline(x=sim_time, line=dict(color="white", width=2, dash="dash"), opacity=0.7)
+    return fig
+
+
+def build_playback_figure(gantt_df, view_mode="Single-line", speed=1.0, max_frames=PLAYBACK_MAX_FRAMES, cores=None):
+    """Gantt figure that animates its own time cursor in the browser.
+
+    The bars are sent once; each frame only moves a two-point cursor trace,
+    so playback needs no Streamlit reruns and costs the server nothing per
+    frame.
+    """
+    fig = build_gantt_figure(gantt_df, None, view_mode, cores)
+    if gantt_df.empty:
+        return fig
+    span = float(gantt_df["end"].max())
+    n_frames = int(min(max_frames, max(2, np.ceil(span / PLAYBACK_STEP) + 1)))
+    times = np.linspace(0.0, span, n_frames)
+    # Same pace as the old server loop: PLAYBACK_STEP time units per
+    # PLAYBACK_FRAME_MS at speed 1, clamped to what browsers can draw.
+    step = span / (n_frames - 1)
+    duration = int(np.clip(PLAYBACK_FRAME_MS * step / PLAYBACK_STEP / max(speed, 1e-6), 16, 1000))
+
+    cursor = len(fig.data)
+    fig.add_trace(go.Scatter(x=[0.0, 0.0], y=[0, 1], yaxis="y2", mode="lines", hoverinfo="skip",
+                             line=dict(color="white", width=2, dash="dash"), showlegend=False))
+    fig.frames = [go.Frame(data=[go.Scatter(x=[t, t])], traces=[cursor], name=f"{t:.2f}") for t in times]
+    play = dict(frame=dict(duration=duration, redraw=False), transition=dict(duration=0), fromcurrent=True, mode="immediate")
+    pause = dict(frame=dict(duration=0, redraw=False), transition=dict(duration=0), mode="immediate")
+    fig.update_layout(
+        yaxis2=dict(overlaying="y", range=[0, 1], visible=False, fixedrange=True),
+        updatemenus=[dict(type="buttons", direction="left", x=0, y=-0.25, xanchor="left", yanchor="top", showactive=False,
+                          buttons=[dict(label="▶ Play", method="animate", args=[None, play]),
+                                   dict(label="⏸ Pause", method="animate", args=[[None], pause])])],
+        sliders=[dict(x=0.18, y=-0.2, len=0.82, currentvalue=dict(prefix="t = "), pad=dict(t=0),
+                      steps=[dict(method="animate", label=f.name, args=[[f.name], pause]) for f in fig.frames])],
+    )
+    fig.update_layout(height=fig.layout.height + 80, margin=dict(b=110))
+    return fig